@@ -1,2 +1,15 @@
-from .baselinker import Baselinker
-from .request import Request
+from .baselinker import Baselinker, AsyncBaselinker
+from .request import Request, NULL
+from .rate_limiter import TokenBucket, SqliteTokenBucket
+from .retry import RetryPolicy
+from .batch import BatchResult, run_batch
+from .pagination import BaselinkerError
+from .async_request import AsyncRequest
+from .backfill import OrderBackfill
+from .journal import JournalFollower, OrderChange
+from .order_mirror import OrderMirror
+from .receipts import ReceiptPoller
+from .export import export_invoices
+from .models import Invoice, InventoryProduct, Order, OrderProduct
+from .inventory_sync import InventorySync
+from .catalog_index import CatalogIndex
@@ -0,0 +1,122 @@
+import asyncio
+import functools
+
+import requests
+
+from .request import Request
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+def sync_only(method):
+    """
+        Marks a client helper that runs blocking calls (thread pools, pagination, streaming, uploads).
+        It raises TypeError on clients using AsyncRequest, whose methods return coroutines, instead of
+        silently dropping or misreading them.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if isinstance(self.request, AsyncRequest):
+            raise TypeError('{}.{} is not supported by the async client'.format(type(self).__name__,
+                                                                                method.__name__))
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+class AsyncRequest(Request):
+    """
+    Asyncio variant of Request. make_request is a coroutine, so every client method built on top of it
+    returns an awaitable. Requests are sent with aiohttp when it is installed, otherwise the pooled
+    requests session is run in the default thread pool executor.
+    """
+
+    def __init__(self, api_token, pool_connections=10, pool_maxsize=100, max_retries=0, keep_alive=True,
+                 rate_limiter=None, retry_policy=None, codec=None):
+        """
+        Keywords:
+            pool_maxsize (int): (optional) Maximum number of concurrent connections, 100 by default.
+            Other keywords are the same as in Request.
+        """
+        super().__init__(api_token, pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                         max_retries=max_retries, keep_alive=keep_alive, rate_limiter=rate_limiter,
+                         retry_policy=retry_policy, codec=codec)
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.client_session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Method that closes the aiohttp session and all pooled connections.
+        """
+        if self.client_session is not None:
+            await self.client_session.close()
+            self.client_session = None
+        self.close()
+
+    def __get_client_session(self):
+        # aiohttp sessions have to be created inside a running event loop.
+        if self.client_session is None:
+            connector = aiohttp.TCPConnector(limit=self.pool_maxsize, force_close=not self.keep_alive)
+            self.client_session = aiohttp.ClientSession(connector=connector)
+        return self.client_session
+
+    async def __post(self, requests_data, headers):
+        """
+        Method that sends a single request.
+        Returns:
+            (status_code, content): HTTP status code and raw body of the response.
+        """
+        if aiohttp is None:
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(
+                None, functools.partial(self.session.post, self.api_url, data=requests_data, headers=headers))
+            return response.status_code, response.content
+        try:
+            async with self.__get_client_session().post(self.api_url, data=requests_data,
+                                                        headers=headers) as response:
+                return response.status, await response.read()
+        except asyncio.TimeoutError as e:
+            raise requests.Timeout(e) from e
+        except aiohttp.ClientConnectionError as e:
+            raise requests.ConnectionError(e) from e
+        except aiohttp.ClientError as e:
+            raise requests.RequestException(e) from e
+
+    async def make_request(self, method_name, **kwargs):
+        """
+        Coroutine that sends request to api endpoint.
+        Keywords:
+            method_name (str): (required) Name of the method to invoke.
+            (**kwargs): (required) Parameters specified by user.
+        Returns:
+            content(json): Method returns content of the response formatted as json string.
+        """
+        requests_data, headers = self._prepare_request(method_name, kwargs)
+        attempt = 1
+        while True:
+            if self.rate_limiter is not None:
+                await asyncio.sleep(self.rate_limiter.reserve())
+            try:
+                status_code, body = await self.__post(requests_data, headers)
+            except requests.RequestException as e:
+                delay = self._get_retry_delay(method_name, attempt, exception=e)
+                if delay is None:
+                    raise e
+            else:
+                delay = self._get_retry_delay(method_name, attempt, status_code=status_code)
+                if delay is None:
+                    content = self._decode_content(body)
+                    delay = self._get_retry_delay(method_name, attempt, content=content)
+                    if delay is None:
+                        return content
+            await asyncio.sleep(delay)
+            attempt += 1
@@ -0,0 +1,101 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .checkpoint import load_checkpoint, save_checkpoint
+
+
+class OrderBackfill:
+    """
+    Parallel backfill of historical orders. The date_confirmed range is split into windows that are
+    fetched concurrently with Orders.iter_orders and merged back into one stream ordered by window.
+    Windows do not overlap, so the stream has no duplicates. Finished windows are checkpointed and
+    skipped when an interrupted backfill is started again.
+    """
+
+    def __init__(self, orders, date_from, date_to, partition_seconds=7 * 24 * 3600, max_workers=4,
+                 checkpoint_path=None, get_unconfirmed_orders=None, status_id=None, filter_email=None):
+        """
+        Keywords:
+            orders (Orders): (required) Orders client used to fetch pages, its rate limiter is shared by all workers.
+            date_from (int): (required) Start of the date_confirmed range, unix time stamp (inclusive).
+            date_to (int): (required) End of the date_confirmed range, unix time stamp (exclusive).
+            partition_seconds (int): (optional) Length of a single window, 7 days by default.
+            max_workers (int): (optional) Number of windows fetched concurrently, 4 by default.
+            checkpoint_path (str): (optional) Path of the JSON file recording finished windows.
+            get_unconfirmed_orders, status_id, filter_email: (optional) Filters passed to get_orders.
+        """
+        if date_to <= date_from:
+            raise ValueError('date_to must be greater than date_from')
+        if partition_seconds < 1 or max_workers < 1:
+            raise ValueError('partition_seconds and max_workers must be positive')
+        self.orders = orders
+        self.date_from = date_from
+        self.date_to = date_to
+        self.partition_seconds = partition_seconds
+        self.max_workers = max_workers
+        self.checkpoint_path = checkpoint_path
+        self.filters = {'get_unconfirmed_orders': get_unconfirmed_orders, 'status_id': status_id,
+                        'filter_email': filter_email}
+        self.completed = self.__load_completed()
+
+    def __checkpoint_key(self):
+        return {'date_from': self.date_from, 'date_to': self.date_to, 'partition_seconds': self.partition_seconds,
+                'filters': self.filters}
+
+    def __load_completed(self):
+        if self.checkpoint_path is None:
+            return set()
+        checkpoint = load_checkpoint(self.checkpoint_path)
+        if checkpoint is None:
+            return set()
+        if checkpoint['key'] != self.__checkpoint_key():
+            raise ValueError('Checkpoint {} belongs to a different backfill'.format(self.checkpoint_path))
+        return set(checkpoint['completed'])
+
+    def __mark_completed(self, start):
+        self.completed.add(start)
+        if self.checkpoint_path is not None:
+            save_checkpoint(self.checkpoint_path, {'key': self.__checkpoint_key(),
+                                                   'completed': sorted(self.completed)})
+
+    @property
+    def partitions(self):
+        """
+            (start, end) windows of the backfill in date order, including finished ones.
+        """
+        return [(start, min(start + self.partition_seconds, self.date_to))
+                for start in range(self.date_from, self.date_to, self.partition_seconds)]
+
+    @property
+    def pending_partitions(self):
+        return [partition for partition in self.partitions if partition[0] not in self.completed]
+
+    def __fetch_partition(self, partition):
+        start, end = partition
+        return list(self.orders.iter_orders(date_confirmed_from=start, date_confirmed_to=end, prefetch=False,
+                                            **self.filters))
+
+    def __iter__(self):
+        """
+            Yields orders of pending windows ordered by window. A window is checkpointed once all of its
+            orders have been consumed, so at most max_workers windows are held in memory.
+        """
+        partitions = iter(self.pending_partitions)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                for partition in partitions:
+                    pending.append((partition, executor.submit(self.__fetch_partition, partition)))
+                    if len(pending) < self.max_workers:
+                        continue
+                    yield from self.__drain(pending.popleft())
+                while pending:
+                    yield from self.__drain(pending.popleft())
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+    def __drain(self, item):
+        partition, future = item
+        yield from future.result()
+        self.__mark_completed(partition[0])
@@ -1,4 +1,8 @@
 from .request import Request
+from .async_request import AsyncRequest, sync_only
+from .rate_limiter import TokenBucket
+from .retry import RetryPolicy
+from .batch import run_batch
 from .orders import Orders
 from .external_storages import ExternalStorages
 from .product_catalog import ProductCatalog
@@ -7,9 +11,99 @@ from .product_catalog import ProductCatalog
 class Baselinker:
     """Baselinker API client"""
 
-    def __init__(self, api_token):
+    request_class = Request
+
+    def __init__(self, api_token, request=None, requests_per_minute=100, burst=1, rate_limiter=None,
+                 retry_policy=None, models=False):
+        """
+        Keywords:
+            api_token (str): (required) BaseLinker API token.
+            request (Request): (optional) Transport shared by all sub-clients, a new Request is created when omitted.
+            requests_per_minute (int): (optional) Client-side limit shared by all calls, matches BaseLinker quota
+            of 100 requests per minute by default. Set to None to disable limiting.
+            burst (int): (optional) Number of requests that may be sent back to back, 1 by default.
+            rate_limiter (TokenBucket|SqliteTokenBucket): (optional) Limiter used instead of the in-process one,
+            e.g. SqliteTokenBucket shared by several worker processes.
+            retry_policy (RetryPolicy): (optional) Retry policy for transient errors, RetryPolicy() by default.
+            Limiter and retry settings are ignored when request is given.
+            models (bool): (optional) Return orders, invoices and catalog products as compact models
+            (Order, Invoice, InventoryProduct) instead of dicts. They support the same key access as dicts.
+        """
         self.api_token = api_token
-        self.request = Request(self.api_token)
-        self.orders = Orders(self.api_token)
-        self.external_storages = ExternalStorages(self.api_token)
-        self.product_catalog = ProductCatalog(self.api_token)
+        if request is None:
+            if rate_limiter is None and requests_per_minute:
+                rate_limiter = TokenBucket(requests_per_minute, burst=burst)
+            request = self.request_class(self.api_token, rate_limiter=rate_limiter,
+                                         retry_policy=retry_policy if retry_policy is not None else RetryPolicy())
+        self.request = request
+        self.orders = Orders(self.api_token, request=self.request, models=models)
+        self.external_storages = ExternalStorages(self.api_token, request=self.request)
+        self.product_catalog = ProductCatalog(self.api_token, request=self.request, models=models)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+            Closes pooled connections held by the client.
+        """
+        self.request.close()
+
+    def __resolve_method(self, method):
+        if callable(method):
+            return method
+        client_name, _, method_name = method.rpartition('.')
+        clients = [getattr(self, client_name)] if client_name else \
+            [self.orders, self.external_storages, self.product_catalog]
+        for client in clients:
+            if hasattr(client, method_name):
+                return getattr(client, method_name)
+        raise AttributeError('Unknown method: {}'.format(method))
+
+    @sync_only
+    def map(self, method, kwargs_iterable, max_workers=8, ordered=True):
+        """
+            Runs a client method for every kwargs dict on a bounded thread pool.
+            Calls share the pooled session, rate limiter and retry policy of the client.
+        Keywords:
+            method (str|callable): (required) Method name, e.g. "get_order_payments_history" or
+            "orders.set_order_status", or a bound client method.
+            kwargs_iterable (iterable): (required) Iterable of dicts with keyword arguments for each call.
+            max_workers (int): (optional) Number of worker threads, 8 by default.
+            Keep it below the pool size of the request to reuse connections.
+            ordered (bool): (optional) Yield results in input order (default) or as soon as they complete.
+        Returns:
+            generator: BatchResult with kwargs and either result or error for every call.
+        """
+        return run_batch(self.__resolve_method(method), kwargs_iterable, max_workers=max_workers, ordered=ordered)
+
+
+class AsyncBaselinker(Baselinker):
+    """
+    Asyncio Baselinker API client. Sub-clients expose the same API methods as Baselinker,
+    each returning an awaitable, e.g. await client.orders.get_orders(). Helpers built on thread pools,
+    pagination, streaming or file uploads (map, iter_*, stream_*, bulk updates, update_order_if_changed,
+    add_order_invoice_file with a path or file object) raise TypeError, use asyncio.gather instead.
+    """
+
+    request_class = AsyncRequest
+
+    def __init__(self, api_token, models=False, **kwargs):
+        if models:
+            raise ValueError('models are not supported by the async client')
+        super().__init__(api_token, **kwargs)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+            Closes pooled connections held by the client.
+        """
+        await self.request.aclose()
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+from .checkpoint import load_checkpoint, save_checkpoint
+
+
+class BatchResult:
+    """Outcome of a single call made by run_batch"""
+
+    __slots__ = ('index', 'kwargs', 'result', 'error')
+
+    def __init__(self, index, kwargs, result=None, error=None):
+        self.index = index
+        self.kwargs = kwargs
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self):
+        """
+            True when the call neither raised nor returned an API error response.
+        """
+        return self.failure is None
+
+    @property
+    def failure(self):
+        """
+            Exception raised by the call or the API error response, None when the call succeeded.
+        """
+        if self.error is not None:
+            return self.error
+        if isinstance(self.result, dict) and self.result.get('status') == 'ERROR':
+            return self.result
+        return None
+
+    def __repr__(self):
+        return 'BatchResult(index={!r}, kwargs={!r}, result={!r}, error={!r})'.format(
+            self.index, self.kwargs, self.result, self.error)
+
+
+def _call(func, index, kwargs):
+    try:
+        return BatchResult(index, kwargs, result=func(**kwargs))
+    except Exception as e:
+        return BatchResult(index, kwargs, error=e)
+
+
+def _pop_finished(pending, ordered):
+    if ordered:
+        return [pending.popleft().result()]
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        pending.remove(future)
+    return [future.result() for future in done]
+
+
+def run_batch(func, kwargs_iterable, max_workers=8, ordered=True):
+    """
+        Calls func once for every kwargs dict on a bounded thread pool.
+        At most 2 * max_workers calls are queued at a time, so the input iterable is consumed lazily.
+        Exceptions raised by a call are stored in its BatchResult instead of aborting the batch.
+    Keywords:
+        func (callable): (required) Function to call, e.g. a bound client method.
+        kwargs_iterable (iterable): (required) Iterable of dicts with keyword arguments for each call.
+        max_workers (int): (optional) Number of worker threads, 8 by default.
+        ordered (bool): (optional) Yield results in input order (default) or as soon as they complete.
+    Returns:
+        generator: BatchResult for every call.
+    """
+    if max_workers < 1:
+        raise ValueError('max_workers must be at least 1')
+    items = enumerate(kwargs_iterable)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for index, kwargs in items:
+                pending.append(executor.submit(_call, func, index, kwargs))
+                if len(pending) >= 2 * max_workers:
+                    yield from _pop_finished(pending, ordered)
+            while pending:
+                yield from _pop_finished(pending, ordered)
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def chunked(iterable, size):
+    """
+        Lazily splits an iterable into lists of at most size items.
+    """
+    if size < 1:
+        raise ValueError('size must be at least 1')
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _merge_warnings(merged, warnings):
+    if isinstance(warnings, dict):
+        merged.update(warnings)
+        return merged
+    if isinstance(warnings, list):
+        return (merged or []) + warnings
+    return merged
+
+
+def _chunk_digest(kwargs):
+    return hashlib.sha1(json.dumps(kwargs, default=str).encode('utf-8')).hexdigest()
+
+
+def run_chunked(func, chunk_kwargs, chunks, max_workers=4, checkpoint_path=None, checkpoint_key=None):
+    """
+        Sends chunks of a bulk update concurrently and merges the "counter" and "warnings" of their responses.
+        With checkpoint_path, successful chunks are recorded with a digest of their contents after each response.
+        When the update is run again, chunks with the same position and contents are skipped, so after a partial
+        failure only the failed and unsent chunks are retried, while a different feed is sent in full.
+        The checkpoint is removed once a run finishes without failed chunks.
+    Keywords:
+        func (callable): (required) Bulk update method, e.g. ProductCatalog.update_inventory_products_stock.
+        chunk_kwargs (callable): (required) Function returning keyword arguments of func for a chunk.
+        chunks (iterable): (required) Chunks to send, e.g. from chunked().
+        max_workers (int): (optional) Number of chunks sent concurrently, 4 by default.
+        checkpoint_path (str): (optional) Path of the JSON file recording finished chunks.
+        checkpoint_key: (optional) JSON-serializable value identifying the update in the checkpoint.
+    Returns:
+        report(dict): Total "counter", merged "warnings", number of "chunks" and "errors" mapping chunk index
+        to the exception or error response.
+    Raises:
+        ValueError: When the checkpoint belongs to a different update.
+    """
+    report = {'counter': 0, 'warnings': {}, 'chunks': 0, 'errors': {}}
+    previous = {}
+    checkpoint = load_checkpoint(checkpoint_path) if checkpoint_path is not None else None
+    if checkpoint is not None:
+        if checkpoint['key'] != checkpoint_key:
+            raise ValueError('Checkpoint {} belongs to a different update'.format(checkpoint_path))
+        previous = checkpoint['chunks']
+    completed = {}
+
+    def complete(index, digest, counter, warnings):
+        report['counter'] += counter
+        report['warnings'] = _merge_warnings(report['warnings'], warnings)
+        completed[str(index)] = [digest, counter, warnings]
+
+    def pending_chunks():
+        for index, chunk in enumerate(chunks):
+            report['chunks'] += 1
+            kwargs = chunk_kwargs(chunk)
+            digest = _chunk_digest(kwargs) if checkpoint_path is not None else None
+            done = previous.get(str(index))
+            if done is not None and done[0] == digest:
+                complete(index, *done)
+                continue
+            yield dict(kwargs, _index=index, _digest=digest)
+
+    def send(_index, _digest, **kwargs):
+        return func(**kwargs)
+
+    for result in run_batch(send, pending_chunks(), max_workers=max_workers):
+        index = result.kwargs['_index']
+        if result.failure is not None:
+            report['errors'][index] = result.failure
+            continue
+        complete(index, result.kwargs['_digest'], int(result.result.get('counter') or 0),
+                 result.result.get('warnings'))
+        if checkpoint_path is not None:
+            save_checkpoint(checkpoint_path, {'key': checkpoint_key, 'chunks': completed})
+    if checkpoint_path is not None and not report['errors'] and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return report
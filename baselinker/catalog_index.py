@@ -0,0 +1,174 @@
+import threading
+
+from .checkpoint import load_checkpoint, save_checkpoint
+
+
+class CatalogIndex:
+    """
+    In-memory index of a catalog mapping SKU and EAN to product_id and variants to their parent product.
+    It is built from ProductCatalog.iter_inventory_products, optionally with variants read from
+    iter_inventory_products_data, and can be saved to disk so workers start warm.
+    getInventoryProductLogs only returns logs of a given product, so refresh() picks up new products
+    by walking the products list newest first down to the highest indexed ID. Deleted products and
+    changed SKUs are only dropped by a full rebuild() or by discard().
+    """
+
+    def __init__(self, product_catalog, inventory_id, with_variants=False, max_workers=4):
+        """
+        Keywords:
+            product_catalog (ProductCatalog): (required) Catalog client.
+            inventory_id (int): (required) Catalog ID.
+            with_variants (bool): (optional) Index variants as well, this also downloads product data.
+            max_workers (int): (optional) Number of pages or product data chunks fetched concurrently.
+        """
+        self.product_catalog = product_catalog
+        self.inventory_id = inventory_id
+        self.with_variants = with_variants
+        self.max_workers = max_workers
+        self.__lock = threading.Lock()
+        self.__clear()
+
+    def __clear(self):
+        self.products = {}
+        self.__by_sku = {}
+        self.__by_ean = {}
+        self.__variants = {}
+
+    def __swap(self, staging):
+        with self.__lock:
+            self.products = staging.products
+            self.__by_sku = staging.__by_sku
+            self.__by_ean = staging.__by_ean
+            self.__variants = staging.__variants
+
+    def __staging(self):
+        return CatalogIndex(self.product_catalog, self.inventory_id, self.with_variants, self.max_workers)
+
+    def __len__(self):
+        return len(self.products)
+
+    def __add(self, product_id, sku, ean, parent_id=None):
+        product_id = int(product_id)
+        self.__remove(product_id)
+        self.products[product_id] = (sku or None, ean or None, parent_id)
+        if sku:
+            self.__by_sku[sku] = product_id
+        if ean:
+            self.__by_ean[ean] = product_id
+        if parent_id is not None:
+            self.__variants.setdefault(parent_id, []).append(product_id)
+
+    def __remove(self, product_id):
+        entry = self.products.pop(product_id, None)
+        if entry is None:
+            return
+        sku, ean, parent_id = entry
+        if sku and self.__by_sku.get(sku) == product_id:
+            del self.__by_sku[sku]
+        if ean and self.__by_ean.get(ean) == product_id:
+            del self.__by_ean[ean]
+        if parent_id is not None and product_id in self.__variants.get(parent_id, ()):
+            self.__variants[parent_id].remove(product_id)
+        for variant_id in self.__variants.pop(product_id, []):
+            self.__remove(variant_id)
+
+    def __index_products(self, products):
+        products = list(products)
+        with self.__lock:
+            for product in products:
+                parent_id = product.get('parent_id')
+                self.__add(product['id'], product.get('sku'), product.get('ean'),
+                           int(parent_id) if parent_id and int(parent_id) else None)
+        if not self.with_variants or not products:
+            return
+        product_ids = [int(product['id']) for product in products]
+        data = self.product_catalog.iter_inventory_products_data(self.inventory_id, product_ids,
+                                                                 max_workers=self.max_workers)
+        for product_id, product in data:
+            with self.__lock:
+                for variant_id, variant in (product.get('variants') or {}).items():
+                    self.__add(variant_id, variant.get('sku'), variant.get('ean'), int(product_id))
+
+    def rebuild(self):
+        """
+            Builds the index from scratch from the full products list. The new index is built aside
+            and swapped in when complete, so lookups keep using the old one meanwhile.
+        Returns:
+            count(int): Number of indexed products and variants.
+        """
+        products = self.product_catalog.iter_inventory_products(self.inventory_id,
+                                                                pages_in_flight=self.max_workers)
+        staging = self.__staging()
+        staging.__index_products(products)
+        self.__swap(staging)
+        return len(self)
+
+    def refresh(self):
+        """
+            Adds products created since the index was built, reading the products list sorted by ID
+            descending until an already indexed product is reached.
+        Returns:
+            count(int): Number of new products.
+        """
+        with self.__lock:
+            last_product_id = max((product_id for product_id, entry in self.products.items() if entry[2] is None),
+                                  default=0)
+        new_products = []
+        for product in self.product_catalog.iter_inventory_products(self.inventory_id, pages_in_flight=1,
+                                                                    filter_sort='id DESC'):
+            if int(product['id']) <= last_product_id:
+                break
+            new_products.append(product)
+        self.__index_products(new_products)
+        return len(new_products)
+
+    def discard(self, product_id):
+        """
+            Removes a product and its variants, e.g. after the API reported it as missing.
+        """
+        with self.__lock:
+            self.__remove(int(product_id))
+
+    def get_by_sku(self, sku):
+        return self.__by_sku.get(sku)
+
+    def get_by_ean(self, ean):
+        return self.__by_ean.get(ean)
+
+    def get_parent(self, product_id):
+        """
+            Returns the parent product ID of a variant, None for main products and unknown IDs.
+        """
+        entry = self.products.get(int(product_id))
+        return entry[2] if entry is not None else None
+
+    def get_variants(self, product_id):
+        return list(self.__variants.get(int(product_id), []))
+
+    def save(self, path):
+        """
+            Saves the index atomically to a JSON file.
+        """
+        with self.__lock:
+            entries = [[product_id] + list(entry) for product_id, entry in self.products.items()]
+        save_checkpoint(path, {'inventory_id': self.inventory_id, 'with_variants': self.with_variants,
+                               'products': entries})
+
+    def load(self, path):
+        """
+            Replaces the index with one saved by save().
+        Returns:
+            loaded(bool): False when the file does not exist.
+        Raises:
+            ValueError: When the file holds an index of a different catalog.
+        """
+        data = load_checkpoint(path)
+        if data is None:
+            return False
+        if data['inventory_id'] != self.inventory_id:
+            raise ValueError('Index {} belongs to catalog {}'.format(path, data['inventory_id']))
+        staging = self.__staging()
+        for product_id, sku, ean, parent_id in data['products']:
+            staging.__add(product_id, sku, ean, parent_id)
+        self.__swap(staging)
+        return True
@@ -0,0 +1,38 @@
+import json
+import os
+import tempfile
+
+
+def load_checkpoint(path, default=None):
+    """
+        Loads checkpoint saved with save_checkpoint.
+    Keywords:
+        path (str): (required) Path to the checkpoint file.
+        default: (optional) Value returned when the file does not exist.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return default
+
+
+def save_checkpoint(path, data):
+    """
+        Saves JSON-serializable data atomically: the file is written next to the target, flushed to disk
+        and renamed over it, so a crash leaves either the old or the new checkpoint.
+    Keywords:
+        path (str): (required) Path to the checkpoint file.
+        data: (required) JSON-serializable checkpoint data.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix='.checkpoint-')
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
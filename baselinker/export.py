@@ -0,0 +1,60 @@
+import csv
+import json
+
+from .batch import run_batch
+from .models import as_dict
+
+
+def _with_receipts(orders, invoices, max_workers):
+    def attach_receipt(invoice):
+        response = orders.get_receipt(order_id=invoice['order_id'])
+        receipt = None
+        if response.get('status') == 'SUCCESS':
+            receipt = {key: value for key, value in response.items() if key != 'status'}
+        return dict(as_dict(invoice), receipt=receipt)
+
+    for result in run_batch(attach_receipt, ({'invoice': invoice} for invoice in invoices), max_workers=max_workers):
+        if result.error is not None:
+            raise result.error
+        yield result.result
+
+
+def _csv_value(value):
+    return json.dumps(value) if isinstance(value, (dict, list)) else value
+
+
+def export_invoices(orders, file, format='ndjson', fields=None, with_receipts=False, max_workers=4, **filters):
+    """
+        Writes invoices returned by Orders.iter_invoices to a file with constant memory use.
+    Keywords:
+        orders (Orders): (required) Orders client.
+        file (file object): (required) Text file opened for writing, for CSV open it with newline=''.
+        format (str): (optional) "ndjson" (default) or "csv".
+        fields (list): (optional) CSV columns, scalar fields of the first invoice by default.
+        Nested values such as items or receipt are written as JSON.
+        with_receipts (bool): (optional) Fetch the receipt of every invoice's order concurrently with get_receipt
+        and store it under the "receipt" key (None when the order has no receipt).
+        max_workers (int): (optional) Number of concurrent get_receipt calls.
+        (**filters): Filters passed to Orders.iter_invoices, e.g. date_from or series_id.
+    Returns:
+        count(int): Number of written invoices.
+    """
+    if format not in ('ndjson', 'csv'):
+        raise ValueError('format must be "ndjson" or "csv"')
+    invoices = orders.iter_invoices(**filters)
+    if with_receipts:
+        invoices = _with_receipts(orders, invoices, max_workers)
+    writer = None
+    count = 0
+    for invoice in invoices:
+        invoice = as_dict(invoice)
+        if format == 'ndjson':
+            file.write(json.dumps(invoice) + '\n')
+        else:
+            if writer is None:
+                columns = fields or [key for key, value in invoice.items() if not isinstance(value, (dict, list))]
+                writer = csv.DictWriter(file, fieldnames=columns, extrasaction='ignore')
+                writer.writeheader()
+            writer.writerow({key: _csv_value(value) for key, value in invoice.items()})
+        count += 1
+    return count
@@ -1,10 +1,19 @@
 from .request import Request
+from .async_request import sync_only
+from .batch import chunked, run_chunked
+
+STOCK_UPDATE_CHUNK_SIZE = 1000
 
 
 class ExternalStorages:
-    def __init__(self, api_token):
+    def __init__(self, api_token, request=None):
+        """
+        Keywords:
+            api_token (str): (required) BaseLinker API token.
+            request (Request): (optional) Shared transport, a new Request is created when omitted.
+        """
         self.api_token = api_token
-        self.request = Request(self.api_token)
+        self.request = request if request is not None else Request(self.api_token)
 
     def get_external_storages_list(self):
         """
@@ -97,4 +106,27 @@ class ExternalStorages:
             2 => Stock quantity (int)
         """
         return self.request.make_request('updateExternalStorageProductsQuantity', storage_id=storage_id,
-                                         products=products)
\ No newline at end of file
+                                         products=products)
+
+    @sync_only
+    def bulk_update_external_storage_products_quantity(self, storage_id, products,
+                                                       chunk_size=STOCK_UPDATE_CHUNK_SIZE, max_workers=4,
+                                                       checkpoint_path=None):
+        """
+            Updates stock of any number of products with update_external_storage_products_quantity, sending
+            chunks of at most 1000 products concurrently under the rate limit of the client.
+        Keywords:
+            storage_id varchar(30): (required) Storage ID in format "[type:shop|warehouse]_[id:int]" (e.g. "shop_2445").
+            products iterable: (required) [product_id, variant_id, quantity] items, e.g. a generator over a feed.
+            chunk_size int: (optional) Number of products sent in a single call, 1000 by default.
+            max_workers int: (optional) Number of chunks sent concurrently, 4 by default.
+            checkpoint_path str: (optional) Path of the JSON file recording finished chunks, a failed update
+            started again with the same products only sends the remaining chunks.
+        Returns:
+            report(dict): Total "counter", merged "warnings", number of "chunks" and "errors" mapping chunk
+            index to the exception or error response.
+        """
+        return run_chunked(self.update_external_storage_products_quantity,
+                           lambda chunk: {'storage_id': storage_id, 'products': [list(item) for item in chunk]},
+                           chunked(products, chunk_size), max_workers=max_workers, checkpoint_path=checkpoint_path,
+                           checkpoint_key=['updateExternalStorageProductsQuantity', storage_id, chunk_size])
@@ -0,0 +1,135 @@
+from .batch import chunked
+from .checkpoint import load_checkpoint, save_checkpoint
+from .pagination import get_records, iter_numbered_pages
+from .product_catalog import INVENTORY_PRODUCTS_PAGE_SIZE, PRICE_UPDATE_CHUNK_SIZE, STOCK_UPDATE_CHUNK_SIZE
+
+
+def _value_changed(current, desired):
+    try:
+        return float(current) != float(desired)
+    except (TypeError, ValueError):
+        return True
+
+
+def _flatten(records, member):
+    """Flattens getInventoryProductsStock/Prices records into {product_id: {key: value}}, variants included"""
+    values = {}
+    for product_id, record in records.items():
+        values[str(product_id)] = {str(key): value for key, value in (record.get(member) or {}).items()}
+        for variant_id, variant_values in (record.get('variants') or {}).items():
+            values[str(variant_id)] = {str(key): value for key, value in (variant_values or {}).items()}
+    return values
+
+
+def diff_values(known, desired):
+    """
+        Returns entries of desired that differ from known values.
+    Keywords:
+        known (dict): (required) Last known {product_id: {warehouse_or_price_group_id: value}}.
+        desired (dict): (required) Desired values in the same format, keys may be ints or strings.
+    Returns:
+        changes(dict): {product_id: {id: value}} with changed entries only, products without changes are left out.
+    """
+    changes = {}
+    for product_id, values in desired.items():
+        current = known.get(str(product_id), {})
+        changed = {key: value for key, value in values.items() if _value_changed(current.get(str(key)), value)}
+        if changed:
+            changes[product_id] = changed
+    return changes
+
+
+class InventorySync:
+    """
+    Delta sync of stocks and prices of a catalog. The last known stock per warehouse and price per price
+    group are kept in memory and optionally on disk. A push compares the desired state with them and sends
+    only changed entries through the bulk update helpers of ProductCatalog. Entries are remembered once
+    their chunk succeeded without a warning, so failed entries are sent again on the next push.
+    """
+
+    def __init__(self, product_catalog, inventory_id, snapshot_path=None, max_workers=4):
+        """
+        Keywords:
+            product_catalog (ProductCatalog): (required) Catalog client.
+            inventory_id (int): (required) Catalog ID.
+            snapshot_path (str): (optional) Path of the JSON file storing known stocks and prices between runs.
+            max_workers (int): (optional) Number of pages or chunks sent concurrently, 4 by default.
+        """
+        self.product_catalog = product_catalog
+        self.inventory_id = inventory_id
+        self.snapshot_path = snapshot_path
+        self.max_workers = max_workers
+        self.stock = {}
+        self.prices = {}
+        snapshot = load_checkpoint(snapshot_path) if snapshot_path is not None else None
+        if snapshot is not None:
+            if snapshot['inventory_id'] != inventory_id:
+                raise ValueError('Snapshot {} belongs to catalog {}'.format(snapshot_path, snapshot['inventory_id']))
+            self.stock = snapshot['stock']
+            self.prices = snapshot['prices']
+
+    def __save(self):
+        if self.snapshot_path is not None:
+            save_checkpoint(self.snapshot_path, {'inventory_id': self.inventory_id, 'stock': self.stock,
+                                                 'prices': self.prices})
+
+    def __fetch_all(self, method, method_name, member):
+        def fetch_page(page):
+            return get_records(method_name, method(self.inventory_id, page=page), 'products') or {}
+
+        def is_last_page(records):
+            return len(records) < INVENTORY_PRODUCTS_PAGE_SIZE
+
+        values = {}
+        for _, records in iter_numbered_pages(fetch_page, is_last_page, pages_in_flight=self.max_workers):
+            values.update(_flatten(records, member))
+        return values
+
+    def refresh(self):
+        """
+            Replaces known stocks and prices with the current state read from
+            get_inventory_products_stock and get_inventory_products_prices.
+        Raises:
+            BaselinkerError: When the API returns an error response.
+        """
+        self.stock = self.__fetch_all(self.product_catalog.get_inventory_products_stock,
+                                      'getInventoryProductsStock', 'stock')
+        self.prices = self.__fetch_all(self.product_catalog.get_inventory_products_prices,
+                                       'getInventoryProductsPrices', 'prices')
+        self.__save()
+
+    def __push(self, known, desired, bulk_update, chunk_size):
+        changes = diff_values(known, desired)
+        report = bulk_update(self.inventory_id, changes, chunk_size=chunk_size, max_workers=self.max_workers)
+        warnings = report['warnings'] if isinstance(report['warnings'], dict) else {}
+        for index, chunk in enumerate(chunked(changes.items(), chunk_size)):
+            if index in report['errors']:
+                continue
+            for product_id, values in chunk:
+                if str(product_id) not in warnings:
+                    known.setdefault(str(product_id), {}).update((str(key), value) for key, value in values.items())
+        self.__save()
+        report['changed'] = len(changes)
+        return report
+
+    def push_stock(self, desired):
+        """
+            Sends stocks that differ from the known ones with bulk_update_inventory_products_stock.
+        Keywords:
+            desired (dict): (required) Full or partial feed {product_id: {warehouse_id: stock}}, variants by their ID.
+        Returns:
+            report(dict): Report of the bulk update with the number of "changed" products.
+        """
+        return self.__push(self.stock, desired, self.product_catalog.bulk_update_inventory_products_stock,
+                           STOCK_UPDATE_CHUNK_SIZE)
+
+    def push_prices(self, desired):
+        """
+            Sends prices that differ from the known ones with bulk_update_inventory_products_prices.
+        Keywords:
+            desired (dict): (required) Full or partial feed {product_id: {price_group_id: price}}, variants by their ID.
+        Returns:
+            report(dict): Report of the bulk update with the number of "changed" products.
+        """
+        return self.__push(self.prices, desired, self.product_catalog.bulk_update_inventory_products_prices,
+                           PRICE_UPDATE_CHUNK_SIZE)
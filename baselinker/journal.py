@@ -0,0 +1,115 @@
+import threading
+
+from .batch import run_batch
+from .checkpoint import load_checkpoint, save_checkpoint
+from .pagination import get_records
+
+JOURNAL_PAGE_SIZE = 100
+
+
+class OrderChange:
+    """Journal events of a single order together with its current state"""
+
+    __slots__ = ('order_id', 'events', 'order')
+
+    def __init__(self, order_id, events, order=None):
+        self.order_id = order_id
+        self.events = events
+        self.order = order
+
+    @property
+    def deleted(self):
+        return self.order is None
+
+    def __repr__(self):
+        return 'OrderChange(order_id={!r}, events={}, deleted={})'.format(self.order_id, len(self.events),
+                                                                          self.deleted)
+
+
+class JournalFollower:
+    """
+    Incremental order sync driven by getJournalList. Events newer than the stored last_log_id are grouped
+    by order, only touched orders are fetched again, and the new last_log_id is persisted atomically after
+    the handler has processed the changes (at-least-once delivery).
+    The journal keeps events from the last 3 days, so the follower has to run at least that often.
+    """
+
+    def __init__(self, orders, checkpoint_path=None, logs_types=None, last_log_id=0, max_workers=4):
+        """
+        Keywords:
+            orders (Orders): (required) Orders client used to read the journal and fetch orders.
+            checkpoint_path (str): (optional) Path of the JSON file storing last_log_id.
+            logs_types (array): (optional) Event types to follow, all types by default.
+            last_log_id (int): (optional) Log ID to start from when there is no checkpoint yet.
+            max_workers (int): (optional) Number of orders fetched concurrently.
+        """
+        self.orders = orders
+        self.checkpoint_path = checkpoint_path
+        self.logs_types = logs_types
+        self.max_workers = max_workers
+        checkpoint = load_checkpoint(checkpoint_path) if checkpoint_path is not None else None
+        self.last_log_id = checkpoint['last_log_id'] if checkpoint else last_log_id
+
+    def fetch_changes(self):
+        """
+            Reads journal events after last_log_id and fetches the touched orders. The checkpoint is not moved.
+        Returns:
+            (changes, last_log_id): List of OrderChange in order of the first event and the log ID to commit.
+        Raises:
+            BaselinkerError: When the API returns an error response.
+        """
+        events_by_order = {}
+        last_log_id = self.last_log_id
+        while True:
+            response = self.orders.get_journal_list(last_log_id=last_log_id, logs_types=self.logs_types,
+                                                    order_id=None)
+            logs = get_records('getJournalList', response, 'logs')
+            for log in logs:
+                events_by_order.setdefault(log['order_id'], []).append(log)
+                last_log_id = max(last_log_id, int(log['log_id']))
+            if len(logs) < JOURNAL_PAGE_SIZE:
+                break
+        changes = [OrderChange(order_id, events) for order_id, events in events_by_order.items()]
+        kwargs = ({'order_id': change.order_id, 'get_unconfirmed_orders': True} for change in changes)
+        for change, result in zip(changes, run_batch(self.orders.get_orders, kwargs, max_workers=self.max_workers)):
+            if result.error is not None:
+                raise result.error
+            orders = get_records('getOrders', result.result, 'orders')
+            change.order = orders[0] if orders else None
+        return changes, last_log_id
+
+    def commit(self, last_log_id):
+        """
+            Stores last_log_id in memory and in the checkpoint file.
+        """
+        self.last_log_id = last_log_id
+        if self.checkpoint_path is not None:
+            save_checkpoint(self.checkpoint_path, {'last_log_id': last_log_id})
+
+    def sync_once(self, handler):
+        """
+            Fetches changes, passes them to the handler and commits the checkpoint when the handler succeeds.
+        Keywords:
+            handler (callable): (required) Function called with the list of OrderChange, not called when empty.
+        Returns:
+            changes(int): Number of changed orders.
+        """
+        changes, last_log_id = self.fetch_changes()
+        if changes:
+            handler(changes)
+        if last_log_id != self.last_log_id:
+            self.commit(last_log_id)
+        return len(changes)
+
+    def follow(self, handler, interval=60, stop_event=None):
+        """
+            Runs sync_once every interval seconds until stop_event is set.
+        Keywords:
+            handler (callable): (required) Function called with the list of OrderChange.
+            interval (float): (optional) Seconds between journal polls, 60 by default.
+            stop_event (threading.Event): (optional) Event stopping the loop.
+        """
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            self.sync_once(handler)
+            stop_event.wait(interval)
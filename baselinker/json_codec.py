@@ -0,0 +1,83 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class StdlibCodec:
+    """JSON codec based on the standard library json module"""
+
+    name = 'json'
+
+    @staticmethod
+    def dumps(obj):
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+    @staticmethod
+    def loads(content):
+        # json.loads detects the encoding of bytes itself, no intermediate str copy is made by the caller.
+        return json.loads(content)
+
+
+class OrjsonCodec:
+    """JSON codec based on orjson"""
+
+    name = 'orjson'
+
+    @staticmethod
+    def dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+    @staticmethod
+    def loads(content):
+        return orjson.loads(content)
+
+
+class UjsonCodec:
+    """JSON codec based on ujson"""
+
+    name = 'ujson'
+
+    @staticmethod
+    def dumps(obj):
+        return ujson.dumps(obj, escape_forward_slashes=False, ensure_ascii=False)
+
+    @staticmethod
+    def loads(content):
+        return ujson.loads(content)
+
+
+CODECS = {
+    'orjson': OrjsonCodec,
+    'ujson': UjsonCodec,
+    'json': StdlibCodec,
+}
+
+
+def get_codec(name=None):
+    """
+        Returns JSON codec used to encode request parameters and decode responses.
+    Keywords:
+        name (str): (optional) One of "orjson", "ujson" or "json". The fastest installed codec is picked
+        when omitted, falling back to the standard library.
+    Returns:
+        codec: Object with dumps(obj) -> str and loads(bytes) -> obj methods.
+    """
+    if name is None:
+        if orjson is not None:
+            return OrjsonCodec()
+        if ujson is not None:
+            return UjsonCodec()
+        return StdlibCodec()
+    if name not in CODECS:
+        raise ValueError('Unknown codec: {}, available codecs: {}'.format(name, ', '.join(CODECS)))
+    if (name == 'orjson' and orjson is None) or (name == 'ujson' and ujson is None):
+        raise ImportError('{} is not installed'.format(name))
+    return CODECS[name]()
@@ -0,0 +1,161 @@
+import json
+import re
+
+_STRUCTURE = re.compile(rb'["\[\]{}]')
+_STRING_END = re.compile(rb'["\\]')
+_SCALAR_END = re.compile(rb'[,\]}\s]')
+_NON_WHITESPACE = re.compile(rb'\S')
+_ERROR_MEMBERS = ('status', 'error_code', 'error_message')
+
+
+class _NeedMore(Exception):
+    pass
+
+
+class _Buffer:
+    """
+    Growing byte buffer over an iterable of chunks. Scanning works on raw UTF-8 bytes because multibyte
+    characters never contain ASCII bytes, so structural characters can be searched for without decoding.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.data = b''
+        self.pos = 0
+        self.eof = False
+
+    def run(self, operation):
+        # Operations start from self.pos and are retried from scratch when the buffer runs out.
+        while True:
+            try:
+                return operation()
+            except _NeedMore:
+                self.fill()
+
+    def fill(self):
+        if self.eof:
+            raise ValueError('Unexpected end of JSON stream')
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.eof = True
+        elif self.pos > len(self.data) // 2:
+            self.data = self.data[self.pos:] + chunk
+            self.pos = 0
+        else:
+            self.data += chunk
+
+    def peek(self):
+        match = _NON_WHITESPACE.search(self.data, self.pos)
+        if match is None:
+            raise _NeedMore
+        self.pos = match.start()
+        return self.data[self.pos:self.pos + 1]
+
+    def expect(self, expected):
+        if self.peek() not in expected:
+            raise ValueError('Expected {!r} at position {} of JSON stream'.format(expected, self.pos))
+        self.pos += 1
+        return self.data[self.pos - 1:self.pos]
+
+    def string_end(self, start):
+        index = start + 1
+        while True:
+            match = _STRING_END.search(self.data, index)
+            if match is None:
+                raise _NeedMore
+            if match.group() == b'\\':
+                index = match.end() + 1
+                continue
+            return match.end()
+
+    def value_end(self, start):
+        first = self.data[start:start + 1]
+        if first == b'"':
+            return self.string_end(start)
+        if first not in (b'{', b'['):
+            match = _SCALAR_END.search(self.data, start)
+            if match is not None:
+                return match.start()
+            if self.eof:
+                return len(self.data)
+            raise _NeedMore
+        depth = 0
+        index = start
+        while True:
+            match = _STRUCTURE.search(self.data, index)
+            if match is None:
+                raise _NeedMore
+            token = match.group()
+            if token == b'"':
+                index = self.string_end(match.start())
+                continue
+            depth += 1 if token in (b'{', b'[') else -1
+            index = match.end()
+            if depth == 0:
+                return index
+
+    def read_value(self, loads):
+        def operation():
+            start = self.pos
+            end = self.value_end(start)
+            self.pos = end
+            return loads(self.data[start:end])
+        self.run(self.peek)
+        return self.run(operation)
+
+
+def _iter_container(buffer, loads):
+    closing = b'}' if buffer.run(lambda: buffer.expect((b'{', b'['))) == b'{' else b']'
+    if buffer.run(buffer.peek) == closing:
+        return
+    while True:
+        if closing == b'}':
+            key = buffer.read_value(json.loads)
+            buffer.run(lambda: buffer.expect((b':',)))
+            yield key, buffer.read_value(loads)
+        else:
+            yield buffer.read_value(loads)
+        if buffer.run(lambda: buffer.expect((b',', closing))) == closing:
+            return
+
+
+class MissingMemberError(ValueError):
+    """Raised by iter_member when the response has no requested member, e.g. for error responses"""
+
+    def __init__(self, member, content):
+        self.member = member
+        self.content = content
+        super().__init__('Response has no "{}" member: {}'.format(member, content))
+
+
+def iter_member(chunks, member, loads=json.loads):
+    """
+        Parses a JSON object incrementally and yields records of one of its top-level members.
+        Only a single record is held in memory at a time, members after the requested one are not read.
+    Keywords:
+        chunks (iterable): (required) Iterable of bytes chunks, e.g. response.iter_content().
+        member (str): (required) Name of the top-level member, e.g. "products" or "orders".
+        loads (callable): (optional) Function decoding a single record from bytes.
+    Returns:
+        generator: (key, record) pairs when the member is an object, records when it is an array.
+    Raises:
+        MissingMemberError: When the member is missing, e.g. for error responses. Its content holds
+        the status, error_code and error_message members.
+        ValueError: When the stream is not valid JSON.
+    """
+    buffer = _Buffer(chunks)
+    buffer.run(lambda: buffer.expect((b'{',)))
+    error = {}
+    if buffer.run(buffer.peek) != b'}':
+        while True:
+            key = buffer.read_value(json.loads)
+            buffer.run(lambda: buffer.expect((b':',)))
+            if key == member:
+                yield from _iter_container(buffer, loads)
+                return
+            value = buffer.read_value(json.loads if key in _ERROR_MEMBERS else bytes)
+            if key in _ERROR_MEMBERS:
+                error[key] = value
+            if buffer.run(lambda: buffer.expect((b',', b'}'))) == b'}':
+                break
+    raise MissingMemberError(member, error)
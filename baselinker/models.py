@@ -0,0 +1,188 @@
+import sys
+from collections.abc import Mapping
+
+
+# Fields named like Mapping methods, e.g. items of an invoice, are stored under a prefixed slot
+# and are only available as keys.
+_RESERVED = frozenset(dir(Mapping))
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class _Lazy:
+    """Descriptor parsing a nested list of dicts into models on first access"""
+
+    def __init__(self, model_class):
+        self.model_class = model_class
+
+    def __set_name__(self, owner, name):
+        self.slot = '_' + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = getattr(instance, self.slot)
+        if value and isinstance(value[0], dict):
+            value = [self.model_class.from_dict(item) for item in value]
+            object.__setattr__(instance, self.slot, value)
+        return value
+
+
+class Model(Mapping):
+    """
+    Compact read-only record built from an API response dict. Known fields are stored in __slots__,
+    repeated string values are interned and unknown fields are kept in extra. Models behave like the
+    dicts they replace, so order['order_id'], order.get('email') and dict(order) keep working.
+    """
+
+    __slots__ = ('extra',)
+    fields = ()
+    interned = frozenset()
+    lazy = ()
+
+    def __init__(self, **values):
+        for name in self.fields:
+            if name in values:
+                value = values.pop(name)
+                object.__setattr__(self, self.__slot(name), _intern(value) if name in self.interned else value)
+        object.__setattr__(self, 'extra', values or None)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def __slot(self, name):
+        return '_' + name if name in self.lazy or name in _RESERVED else name
+
+    def __setattr__(self, name, value):
+        raise AttributeError('{} is read-only'.format(type(self).__name__))
+
+    def __getitem__(self, key):
+        if key in self.fields:
+            try:
+                return getattr(self, key if key in self.lazy else self.__slot(key))
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        # Fields missing from the response are left unset, so they are missing keys here as well.
+        for name in self.fields:
+            if hasattr(self, self.__slot(name)):
+                yield name
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        identifier = self.fields[0]
+        return '{}({}={!r})'.format(type(self).__name__, identifier, self.get(identifier))
+
+    def to_dict(self):
+        """
+            Converts the model back to a plain, JSON-serializable dict.
+        """
+        data = {}
+        for key in self:
+            value = getattr(self, self.__slot(key)) if key in self.lazy else self[key]
+            if isinstance(value, list):
+                value = [item.to_dict() if isinstance(item, Model) else item for item in value]
+            data[key] = value
+        return data
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+
+def as_dict(value):
+    """
+        Returns a plain dict for a model and the value itself otherwise, e.g. before json.dumps.
+    """
+    return value.to_dict() if isinstance(value, Model) else value
+
+
+def convert_response(response, member, model_class):
+    """
+        Replaces records in the member of a successful response with models. Records keyed by ID,
+        like products of getInventoryProductsData, are converted with the key passed as product_id.
+    Keywords:
+        response (dict): (required) Decoded API response.
+        member (str): (required) Name of the member holding the records, e.g. "orders".
+        model_class (type): (required) Model subclass, e.g. Order.
+    """
+    records = response.get(member) if response.get('status') == 'SUCCESS' else None
+    if isinstance(records, list):
+        response[member] = [model_class.from_dict(record) for record in records]
+    elif isinstance(records, dict):
+        response[member] = {key: model_class.from_dict(record, key) for key, record in records.items()}
+    return response
+
+
+class OrderProduct(Model):
+    """Single product of an order returned by getOrders"""
+
+    fields = ('order_product_id', 'storage', 'storage_id', 'product_id', 'variant_id', 'name', 'attributes',
+              'sku', 'ean', 'location', 'warehouse_id', 'auction_id', 'price_brutto', 'tax_rate', 'quantity',
+              'weight', 'bundle_id')
+    interned = frozenset(('storage', 'storage_id', 'location', 'attributes'))
+    __slots__ = fields
+
+
+class Order(Model):
+    """Order returned by getOrders, products are parsed into OrderProduct on first access"""
+
+    fields = ('order_id', 'shop_order_id', 'external_order_id', 'order_source', 'order_source_id',
+              'order_source_info', 'order_status_id', 'confirmed', 'date_confirmed', 'date_add', 'date_in_status',
+              'user_login', 'phone', 'email', 'user_comments', 'admin_comments', 'currency', 'payment_method',
+              'payment_method_cod', 'payment_done', 'delivery_method', 'delivery_price', 'delivery_package_module',
+              'delivery_package_nr', 'delivery_fullname', 'delivery_company', 'delivery_address', 'delivery_city',
+              'delivery_state', 'delivery_postcode', 'delivery_country', 'delivery_country_code',
+              'delivery_point_id', 'delivery_point_name', 'delivery_point_address', 'delivery_point_postcode',
+              'delivery_point_city', 'invoice_fullname', 'invoice_company', 'invoice_nip', 'invoice_address',
+              'invoice_city', 'invoice_state', 'invoice_postcode', 'invoice_country', 'invoice_country_code',
+              'want_invoice', 'extra_field_1', 'extra_field_2', 'custom_extra_fields', 'order_page', 'pick_status',
+              'pack_status', 'products')
+    interned = frozenset(('order_source', 'order_source_info', 'currency', 'payment_method', 'delivery_method',
+                          'delivery_package_module', 'delivery_city', 'delivery_country', 'delivery_country_code',
+                          'invoice_city', 'invoice_country', 'invoice_country_code'))
+    lazy = frozenset(('products',))
+    __slots__ = tuple(name for name in fields if name != 'products') + ('_products',)
+    products = _Lazy(OrderProduct)
+
+
+class InventoryProduct(Model):
+    """Catalog product returned by getInventoryProductsData, product_id is taken from the response key"""
+
+    fields = ('product_id', 'is_bundle', 'ean', 'sku', 'tax_rate', 'weight', 'height', 'width', 'length', 'star',
+              'manufacturer_id', 'category_id', 'prices', 'stock', 'locations', 'text_fields', 'average_cost',
+              'average_landed_cost', 'images', 'links', 'variants', 'bundle_products')
+    __slots__ = fields
+
+    @classmethod
+    def from_dict(cls, data, product_id=None):
+        if product_id is not None:
+            data = dict(data, product_id=int(product_id))
+        return cls(**data)
+
+
+class Invoice(Model):
+    """Invoice returned by getInvoices"""
+
+    fields = ('invoice_id', 'order_id', 'series_id', 'type', 'number', 'sub_id', 'day', 'month', 'year', 'postfix',
+              'date_add', 'date_sell', 'date_pay_to', 'currency', 'total_price_brutto', 'total_price_netto',
+              'payment', 'additional_info', 'invoice_fullname', 'invoice_company', 'invoice_nip', 'invoice_address',
+              'invoice_postcode', 'invoice_city', 'invoice_country', 'invoice_country_code', 'seller', 'issuer',
+              'correcting_to_invoice_id', 'correcting_reason', 'correcting_items', 'exchange_currency',
+              'exchange_rate', 'exchange_date', 'exchange_info', 'external_invoice_number', 'items')
+    interned = frozenset(('type', 'currency', 'payment', 'invoice_country', 'invoice_country_code', 'seller',
+                          'issuer', 'exchange_currency'))
+    __slots__ = fields[:-1] + ('_items',)
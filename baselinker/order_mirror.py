@@ -0,0 +1,183 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+
+from .models import as_dict
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS orders (order_id INTEGER PRIMARY KEY, email TEXT, phone TEXT, status_id INTEGER, '
+    'date_confirmed INTEGER, external_order_id TEXT, data TEXT NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS orders_email ON orders (email)',
+    'CREATE INDEX IF NOT EXISTS orders_phone ON orders (phone)',
+    'CREATE INDEX IF NOT EXISTS orders_status_id ON orders (status_id)',
+    'CREATE INDEX IF NOT EXISTS orders_date_confirmed ON orders (date_confirmed)',
+    'CREATE INDEX IF NOT EXISTS orders_external_order_id ON orders (external_order_id)',
+    'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL)',
+)
+
+
+def _normalize_email(email):
+    return email.strip().lower() if email else None
+
+
+def _normalize_phone(phone):
+    return (re.sub(r'\D', '', phone) or None) if phone else None
+
+
+def _int_or_none(value):
+    return int(value) if value not in (None, '') else None
+
+
+class OrderMirror:
+    """
+    Local sqlite copy of orders indexed by email, phone, status, confirmation date and external order ID.
+    It is filled by sync() from get_orders and kept current by apply_changes(), which can be used as a
+    JournalFollower handler. Lookups are served locally while the mirror is fresher than max_age and fall
+    back to the API otherwise.
+    """
+
+    def __init__(self, orders, path=':memory:', max_age=300):
+        """
+        Keywords:
+            orders (Orders): (required) Orders client used to sync the mirror and for API fallback.
+            path (str): (optional) Path of the sqlite database, in memory by default.
+            max_age (float): (optional) Seconds after the last sync when lookups fall back to the API.
+        """
+        self.orders = orders
+        self.max_age = max_age
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        with self.__lock, self.__connection:
+            for statement in _SCHEMA:
+                self.__connection.execute(statement)
+
+    def close(self):
+        self.__connection.close()
+
+    def __get_meta(self, key, default=None):
+        row = self.__connection.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def __set_meta(self, key, value):
+        self.__connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    @property
+    def last_synced_at(self):
+        with self.__lock:
+            return self.__get_meta('last_synced_at')
+
+    @property
+    def is_fresh(self):
+        last_synced_at = self.last_synced_at
+        return last_synced_at is not None and time.time() - last_synced_at <= self.max_age
+
+    def upsert_orders(self, orders):
+        """
+            Inserts or replaces orders in the mirror.
+        Keywords:
+            orders (iterable): (required) Order dicts as returned by get_orders.
+        """
+        rows = [(int(order['order_id']), _normalize_email(order.get('email')), _normalize_phone(order.get('phone')),
+                 _int_or_none(order.get('order_status_id')), _int_or_none(order.get('date_confirmed')),
+                 order.get('external_order_id') or None, json.dumps(as_dict(order))) for order in orders]
+        last_date_confirmed = max((row[4] for row in rows if row[4] is not None), default=None)
+        with self.__lock, self.__connection:
+            self.__connection.executemany('INSERT OR REPLACE INTO orders VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+            if last_date_confirmed is not None and last_date_confirmed > self.__get_meta('last_date_confirmed', 0):
+                self.__set_meta('last_date_confirmed', last_date_confirmed)
+
+    def delete_orders(self, order_ids):
+        with self.__lock, self.__connection:
+            self.__connection.executemany('DELETE FROM orders WHERE order_id = ?',
+                                          [(int(order_id),) for order_id in order_ids])
+
+    def mark_synced(self, synced_at=None):
+        with self.__lock, self.__connection:
+            self.__set_meta('last_synced_at', time.time() if synced_at is None else synced_at)
+
+    def sync(self, batch_size=500):
+        """
+            Downloads orders confirmed since the newest order in the mirror with Orders.iter_orders.
+        Keywords:
+            batch_size (int): (optional) Number of orders written in a single transaction.
+        Returns:
+            count(int): Number of orders written.
+        """
+        started_at = time.time()
+        with self.__lock:
+            date_confirmed_from = int(self.__get_meta('last_date_confirmed', 0))
+        count = 0
+        batch = []
+        for order in self.orders.iter_orders(date_confirmed_from=date_confirmed_from):
+            batch.append(order)
+            if len(batch) >= batch_size:
+                self.upsert_orders(batch)
+                count += len(batch)
+                batch = []
+        self.upsert_orders(batch)
+        self.mark_synced(started_at)
+        return count + len(batch)
+
+    def apply_changes(self, changes):
+        """
+            Applies OrderChange objects from JournalFollower, can be passed to JournalFollower.follow as handler.
+        """
+        self.upsert_orders(change.order for change in changes if not change.deleted)
+        self.delete_orders(change.order_id for change in changes if change.deleted)
+        self.mark_synced()
+
+    def __select(self, where, parameters):
+        with self.__lock:
+            rows = self.__connection.execute('SELECT data FROM orders WHERE {} ORDER BY order_id'.format(where),
+                                             parameters).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get_order(self, order_id):
+        orders = self.__select('order_id = ?', (int(order_id),))
+        return orders[0] if orders else None
+
+    def get_order_statuses(self, order_ids=None):
+        """
+            Returns status_id of mirrored orders, e.g. for Orders.set_order_statuses.
+        Keywords:
+            order_ids (iterable): (optional) Orders to return, all mirrored orders by default.
+        Returns:
+            statuses(dict): status_id for each order_id.
+        """
+        with self.__lock:
+            rows = self.__connection.execute('SELECT order_id, status_id FROM orders').fetchall()
+        statuses = dict(rows)
+        if order_ids is None:
+            return statuses
+        return {int(order_id): statuses[int(order_id)] for order_id in order_ids if int(order_id) in statuses}
+
+    def get_orders_by_status(self, status_id):
+        return self.__select('status_id = ?', (int(status_id),))
+
+    def get_orders_by_external_order_id(self, external_order_id):
+        return self.__select('external_order_id = ?', (str(external_order_id),))
+
+    def get_orders_confirmed_between(self, date_from, date_to):
+        return self.__select('date_confirmed >= ? AND date_confirmed < ?', (date_from, date_to))
+
+    def get_orders_by_email(self, email):
+        """
+            Same as Orders.get_orders_by_email, served locally while the mirror is fresh.
+        Keywords:
+            email (varchar(50): (required) The e-mail address we search for in orders.
+        """
+        if not self.is_fresh:
+            return self.orders.get_orders_by_email(email)
+        return {'status': 'SUCCESS', 'orders': self.__select('email = ?', (_normalize_email(email),))}
+
+    def get_orders_by_phone(self, phone):
+        """
+            Same as Orders.get_orders_by_phone, served locally while the mirror is fresh.
+        Keywords:
+            phone (varchar(50): (required) The phone number we search for in orders.
+        """
+        if not self.is_fresh:
+            return self.orders.get_orders_by_phone(phone)
+        return {'status': 'SUCCESS', 'orders': self.__select('phone = ?', (_normalize_phone(phone),))}
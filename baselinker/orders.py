@@ -1,10 +1,42 @@
-from .request import Request
+import os
+
+from .request import NULL, Request
+from .async_request import AsyncRequest, sync_only
+from .pagination import get_records, iter_pages
+from .batch import run_batch
+from .models import Invoice, Order, convert_response
+
+ORDERS_PAGE_SIZE = 100
+INVOICES_PAGE_SIZE = 100
+# set_order_fields arguments named differently in getOrders responses
+ORDER_FIELD_KEYS = {'pick_state': 'pick_status', 'pack_state': 'pack_status'}
+
+
+def _field_changed(current, desired):
+    if desired is NULL:
+        return current not in (None, '')
+    if isinstance(desired, bool):
+        desired = int(desired)
+    if isinstance(desired, (int, float)):
+        try:
+            return float(current) != float(desired)
+        except (TypeError, ValueError):
+            return True
+    return ('' if current is None else str(current)) != str(desired)
 
 
 class Orders:
-    def __init__(self, api_token):
+    def __init__(self, api_token, request=None, models=False):
+        """
+        Keywords:
+            api_token (str): (required) BaseLinker API token.
+            request (Request): (optional) Shared transport, a new Request is created when omitted.
+            models (bool): (optional) Return orders and invoices as compact Order and Invoice models
+            instead of dicts.
+        """
         self.api_token = api_token
-        self.request = Request(self.api_token)
+        self.models = models
+        self.request = request if request is not None else Request(self.api_token)
 
     def get_journal_list(self, last_log_id, logs_types, order_id):
         """
@@ -45,10 +77,88 @@ class Orders:
             filter_email varchar(50): (optional) Filtering of order lists by e-mail address
             (displays only orders with the given e-mail address).
         """
-        return self.request.make_request('getOrders', order_id=order_id, date_confirmed_from=date_confirmed_from,
-                                         date_from=date_from, id_from=id_from,
-                                         get_unconfirmed_orders=get_unconfirmed_orders,
-                                         status_id=status_id, filter_email=filter_email)
+        response = self.request.make_request('getOrders', order_id=order_id,
+                                             date_confirmed_from=date_confirmed_from, date_from=date_from,
+                                             id_from=id_from, get_unconfirmed_orders=get_unconfirmed_orders,
+                                             status_id=status_id, filter_email=filter_email)
+        return convert_response(response, 'orders', Order) if self.models else response
+
+    @sync_only
+    def iter_orders(self, date_confirmed_from=0, date_confirmed_to=None, id_from=None,
+                    get_unconfirmed_orders=None, status_id=None, filter_email=None, prefetch=True):
+        """
+            Lazily iterates over all orders matching the filters, paging through get_orders.
+            By default pages are advanced by date_confirmed of the last order. Orders sharing the boundary
+            timestamp are de-duplicated, so there are no duplicates or gaps between pages. When id_from is given
+            pages are advanced by order ID instead, which also covers unconfirmed orders.
+        Keywords:
+            date_confirmed_from (int): (optional) Date of order confirmation from which orders are to be collected.
+            Format unix time stamp, 0 by default.
+            date_confirmed_to (int): (optional) Stop before orders confirmed at or after this unix time stamp.
+            Ignored when paging by id_from.
+            id_from (int): (optional) The order ID number from which subsequent orders are to be collected.
+            get_unconfirmed_orders (bool): (optional) Download unconfirmed orders as well.
+            status_id (int): (optional) The status identifier from which orders are to be collected.
+            filter_email varchar(50): (optional) Filtering of order lists by e-mail address.
+            prefetch (bool): (optional) Fetch the next page in the background while the current one is processed.
+        Returns:
+            generator: Order dicts in the order returned by the API.
+        Raises:
+            BaselinkerError: When the API returns an error response.
+        """
+        filters = {'get_unconfirmed_orders': get_unconfirmed_orders, 'status_id': status_id,
+                   'filter_email': filter_email}
+        if id_from is not None:
+            def fetch_page(cursor):
+                return get_records('getOrders', self.get_orders(id_from=cursor, **filters), 'orders')
+
+            def next_cursor(page, cursor):
+                if len(page) < ORDERS_PAGE_SIZE:
+                    return None
+                return max(int(order['order_id']) for order in page) + 1
+
+            for _, page in iter_pages(fetch_page, id_from, next_cursor, prefetch):
+                yield from page
+            return
+
+        def fetch_page(cursor):
+            return get_records('getOrders', self.get_orders(date_confirmed_from=cursor[0], **filters), 'orders')
+
+        def next_cursor(page, cursor):
+            if len(page) < ORDERS_PAGE_SIZE:
+                return None
+            timestamp, seen = cursor
+            last = max(int(order['date_confirmed']) for order in page)
+            if date_confirmed_to is not None and last >= date_confirmed_to:
+                return None
+            boundary = {int(order['order_id']) for order in page if int(order['date_confirmed']) == last}
+            if last == timestamp:
+                if boundary <= seen:
+                    # A full page confirmed within one second, the API gives no way to page inside it.
+                    return last + 1, frozenset()
+                boundary |= seen
+            return last, frozenset(boundary)
+
+        for (_, seen), page in iter_pages(fetch_page, (date_confirmed_from, frozenset()), next_cursor, prefetch):
+            for order in page:
+                if int(order['order_id']) in seen:
+                    continue
+                if date_confirmed_to is not None and int(order['date_confirmed']) >= date_confirmed_to:
+                    return
+                yield order
+
+    @sync_only
+    def stream_orders(self, order_id=None, date_confirmed_from=None, date_from=None, id_from=None,
+                      get_unconfirmed_orders=None, status_id=None, filter_email=None):
+        """
+            Streaming variant of get_orders. The response is parsed incrementally and orders are yielded
+            one at a time, so memory is bounded by a single order instead of the whole page.
+            Keywords are the same as in get_orders.
+        """
+        return self.request.stream_request('getOrders', 'orders', order_id=order_id,
+                                           date_confirmed_from=date_confirmed_from, date_from=date_from,
+                                           id_from=id_from, get_unconfirmed_orders=get_unconfirmed_orders,
+                                           status_id=status_id, filter_email=filter_email)
 
     def get_order_sources(self):
         """
@@ -108,9 +218,40 @@ class Orders:
             series_id (int): (optional) numbering series ID that allows filtering after the invoice numbering series.
             get_external_invoices (bool): (optional, true by default) Download external invoices as well.
         """
-        return self.request.make_request('getInvoices', invoice_id=invoice_id, order_id=order_id,
-                                         date_from=date_from, id_from=id_from, series_id=series_id,
+        response = self.request.make_request('getInvoices', invoice_id=invoice_id, order_id=order_id,
+                                             date_from=date_from, id_from=id_from, series_id=series_id,
+                                             get_external_invoices=get_external_invoices)
+        return convert_response(response, 'invoices', Invoice) if self.models else response
+
+    @sync_only
+    def iter_invoices(self, date_from=None, id_from=0, series_id=None, order_id=None, get_external_invoices=None,
+                      prefetch=True):
+        """
+            Lazily iterates over all invoices matching the filters, paging through get_invoices by invoice ID.
+        Keywords:
+            date_from (int): (optional) Date from which invoices are to be collected. Unix time stamp format.
+            id_from (int): (optional) The invoice ID number from which invoices are to be retrieved, 0 by default.
+            series_id (int): (optional) numbering series ID that allows filtering after the invoice numbering series.
+            order_id (int): (optional) Order identifier.
+            get_external_invoices (bool): (optional, true by default) Download external invoices as well.
+            prefetch (bool): (optional) Fetch the next page in the background while the current one is processed.
+        Returns:
+            generator: Invoice dicts.
+        Raises:
+            BaselinkerError: When the API returns an error response.
+        """
+        def fetch_page(cursor):
+            response = self.get_invoices(order_id=order_id, date_from=date_from, id_from=cursor, series_id=series_id,
                                          get_external_invoices=get_external_invoices)
+            return get_records('getInvoices', response, 'invoices')
+
+        def next_cursor(page, cursor):
+            if len(page) < INVOICES_PAGE_SIZE:
+                return None
+            return max(int(invoice['invoice_id']) for invoice in page) + 1
+
+        for _, page in iter_pages(fetch_page, id_from, next_cursor, prefetch):
+            yield from page
 
     def get_series(self):
         """
@@ -233,6 +374,59 @@ class Orders:
                                          extra_field_2=extra_field_2,
                                          pick_state=pick_state, pack_state=pack_state)
 
+    def get_changed_order_fields(self, order, **desired):
+        """
+            Compares desired set_order_fields values with an order dict returned by get_orders.
+            Values are compared the way the API stores them, e.g. True equals "1" and 10 equals "10.00".
+            Fields set to None are ignored.
+        Returns:
+            changed(dict): set_order_fields keyword arguments whose values differ from the order.
+        """
+        return {field: value for field, value in desired.items()
+                if value is not None and _field_changed(order.get(ORDER_FIELD_KEYS.get(field, field)), value)}
+
+    @sync_only
+    def update_order_if_changed(self, order, **desired):
+        """
+            Diff-based variant of set_order_fields. Only fields that differ from the already fetched order
+            are sent, and the call is skipped entirely when nothing differs.
+        Keywords:
+            order (dict): (required) Order dict returned by get_orders.
+            (**desired): Desired values, the same keywords as in set_order_fields.
+        Returns:
+            content(json): Response of set_order_fields or None when the call was skipped.
+        """
+        changed = self.get_changed_order_fields(order, **desired)
+        if not changed:
+            return None
+        return self.set_order_fields(order_id=order['order_id'], **changed)
+
+    @sync_only
+    def update_orders_if_changed(self, updates, max_workers=8):
+        """
+            Batch variant of update_order_if_changed, changed orders are updated concurrently.
+        Keywords:
+            updates (iterable): (required) (order, desired) pairs, where desired is a dict of
+            set_order_fields keyword arguments.
+            max_workers (int): (optional) Number of concurrent calls, 8 by default.
+        Returns:
+            report(dict): Counts of calls "sent" and "skipped", and "errors" mapping order ID
+            to the exception or error response.
+        """
+        report = {'sent': 0, 'skipped': 0, 'errors': {}}
+        calls = []
+        for order, desired in updates:
+            changed = self.get_changed_order_fields(order, **desired)
+            if changed:
+                calls.append(dict(changed, order_id=order['order_id']))
+            else:
+                report['skipped'] += 1
+        for result in run_batch(self.set_order_fields, calls, max_workers=max_workers):
+            report['sent'] += 1
+            if result.failure is not None:
+                report['errors'][result.kwargs['order_id']] = result.failure
+        return report
+
     def add_order_product(self, order_id=None, storage=None, storage_id=None,
                           product_id=None, variant_id=None, auction_id=None,
                           name=None, sku=None, ean=None, attributes=None,
@@ -330,6 +524,39 @@ class Orders:
         """
         return self.request.make_request('setOrderStatus', order_id=order_id, status_id=status_id)
 
+    @sync_only
+    def set_order_statuses(self, statuses, known_statuses=None, max_workers=8):
+        """
+            Changes status of many orders concurrently, calls share the rate limit of the client.
+            Orders already known to be in the target status are skipped without calling the API.
+        Keywords:
+            statuses (dict): (required) Target status_id for each order_id.
+            known_statuses (dict|iterable): (optional) Current status_id for each order_id, or order dicts
+            from a recent get_orders call (e.g. OrderMirror.get_order_statuses or iter_orders results).
+            max_workers (int): (optional) Number of concurrent calls, 8 by default.
+        Returns:
+            report(dict): Lists of "updated" and "skipped" order IDs and "errors" mapping order ID
+            to the exception or error response.
+        """
+        if known_statuses is None:
+            known_statuses = {}
+        elif not isinstance(known_statuses, dict):
+            known_statuses = {order['order_id']: order['order_status_id'] for order in known_statuses}
+        known_statuses = {int(order_id): int(status_id) for order_id, status_id in known_statuses.items()}
+        report = {'updated': [], 'skipped': [], 'errors': {}}
+        changes = []
+        for order_id, status_id in statuses.items():
+            if known_statuses.get(int(order_id)) == int(status_id):
+                report['skipped'].append(order_id)
+            else:
+                changes.append({'order_id': order_id, 'status_id': status_id})
+        for result in run_batch(self.set_order_status, changes, max_workers=max_workers):
+            if result.failure is not None:
+                report['errors'][result.kwargs['order_id']] = result.failure
+            else:
+                report['updated'].append(result.kwargs['order_id'])
+        return report
+
     def set_order_receipt(self, receipt_id, receipt_nr, date, printer_error=None):
         """
             The method allows you to mark orders with a receipt already issued.
@@ -345,13 +572,45 @@ class Orders:
 
     def add_order_invoice_file(self, invoice_id, file, external_invoice_number):
         """
-            The method allows you to mark orders with a receipt already issued.
+            The method allows you to add an external PDF file to an invoice previously issued from BaseLinker.
         Keywords:
             invoice_id (int): (required) BaseLinker invoice identifier
-            file (text): (required) Invoice PDF file in binary format encoded in base64,
-            at the very beginning of the invoice string provide a prefix "data:" e.g. "data:4AAQSkSzkJRgABA[...]"
+            file (text|path|file object): (required) Invoice PDF file in binary format encoded in base64,
+            at the very beginning of the invoice string provide a prefix "data:" e.g. "data:4AAQSkSzkJRgABA[...]".
+            A pathlib.Path or a binary file object can be given instead, it is then encoded in chunks
+            into a streamed request body without loading the whole file into memory.
             external_invoice_number varchar(30): (required) External system invoice number
             (overwrites BaseLinker invoice number)
         """
+        if not isinstance(file, str) and isinstance(self.request, AsyncRequest):
+            raise TypeError('Streamed invoice files are not supported by the async client, pass a base64 string')
+        if isinstance(file, os.PathLike):
+            with open(file, 'rb') as binary_file:
+                return self.request.upload_request('addOrderInvoiceFile', 'file', binary_file,
+                                                   invoice_id=invoice_id,
+                                                   external_invoice_number=external_invoice_number)
+        if hasattr(file, 'read'):
+            return self.request.upload_request('addOrderInvoiceFile', 'file', file, invoice_id=invoice_id,
+                                               external_invoice_number=external_invoice_number)
         return self.request.make_request('addOrderInvoiceFile', invoice_id=invoice_id, file=file,
                                          external_invoice_number=external_invoice_number)
+
+    @sync_only
+    def add_order_invoice_files(self, invoice_files, max_workers=4):
+        """
+            Uploads many invoice files concurrently with add_order_invoice_file.
+        Keywords:
+            invoice_files (iterable): (required) Dicts with invoice_id, file and external_invoice_number keys,
+            where file is preferably a pathlib.Path so only files being uploaded are open.
+            max_workers (int): (optional) Number of concurrent uploads, 4 by default.
+        Returns:
+            report(dict): List of "uploaded" invoice IDs and "errors" mapping invoice ID
+            to the exception or error response.
+        """
+        report = {'uploaded': [], 'errors': {}}
+        for result in run_batch(self.add_order_invoice_file, invoice_files, max_workers=max_workers):
+            if result.failure is not None:
+                report['errors'][result.kwargs['invoice_id']] = result.failure
+            else:
+                report['uploaded'].append(result.kwargs['invoice_id'])
+        return report
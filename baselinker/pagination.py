@@ -0,0 +1,93 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BaselinkerError(Exception):
+    """Error response returned by the BaseLinker API"""
+
+    def __init__(self, method_name, response):
+        self.method_name = method_name
+        self.error_code = response.get('error_code')
+        self.error_message = response.get('error_message')
+        super().__init__('{} failed: {} {}'.format(method_name, self.error_code, self.error_message))
+
+
+def get_records(method_name, response, member):
+    """
+        Returns a member of a successful response, raising BaselinkerError for error responses.
+    Keywords:
+        method_name (str): (required) Name of the invoked method, used in the error message.
+        response (dict): (required) Decoded response.
+        member (str): (required) Name of the member holding the records, e.g. "orders".
+    """
+    if response.get('status') == 'ERROR':
+        raise BaselinkerError(method_name, response)
+    return response.get(member) or []
+
+
+def iter_pages(fetch_page, cursor, next_cursor, prefetch=True):
+    """
+        Lazily walks paginated results. With prefetch the next page is requested in a background
+        thread as soon as its cursor is known, while the caller processes the current page.
+    Keywords:
+        fetch_page (callable): (required) Function returning a page for a cursor.
+        cursor: (required) Cursor of the first page.
+        next_cursor (callable): (required) Function returning the cursor following (page, cursor),
+        or None after the last page.
+        prefetch (bool): (optional) Fetch the next page in the background, true by default.
+    Returns:
+        generator: (cursor, page) pairs.
+    """
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    future = None
+    try:
+        page = fetch_page(cursor)
+        while True:
+            following = next_cursor(page, cursor)
+            if executor is not None and following is not None:
+                future = executor.submit(fetch_page, following)
+            yield cursor, page
+            if following is None:
+                return
+            page = future.result() if future is not None else fetch_page(following)
+            future = None
+            cursor = following
+    finally:
+        if executor is not None:
+            if future is not None:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+
+def iter_numbered_pages(fetch_page, is_last_page, first_page=1, pages_in_flight=2):
+    """
+        Walks page-numbered results keeping several pages in flight. Pages are requested ahead in
+        background threads and yielded in page order; requests past the last page are cancelled.
+    Keywords:
+        fetch_page (callable): (required) Function returning a page for a page number.
+        is_last_page (callable): (required) Function returning true for the page ending the results.
+        first_page (int): (optional) Number of the first page, 1 by default.
+        pages_in_flight (int): (optional) Number of pages requested concurrently, 2 by default.
+    Returns:
+        generator: (page_number, page) pairs.
+    """
+    if pages_in_flight < 1:
+        raise ValueError('pages_in_flight must be positive')
+    pending = deque()
+    next_page = first_page
+    executor = ThreadPoolExecutor(max_workers=pages_in_flight)
+    try:
+        while True:
+            while len(pending) < pages_in_flight:
+                pending.append((next_page, executor.submit(fetch_page, next_page)))
+                next_page += 1
+            page_number, future = pending.popleft()
+            page = future.result()
+            last = is_last_page(page)
+            yield page_number, page
+            if last:
+                return
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
@@ -1,10 +1,27 @@
 from .request import Request
+from .async_request import sync_only
+from .pagination import get_records, iter_numbered_pages
+from .batch import chunked, run_batch, run_chunked
+from .models import InventoryProduct, convert_response
+
+
+INVENTORY_PRODUCTS_PAGE_SIZE = 1000
+INVENTORY_PRODUCTS_DATA_CHUNK_SIZE = 100
+STOCK_UPDATE_CHUNK_SIZE = 1000
+PRICE_UPDATE_CHUNK_SIZE = 1000
 
 
 class ProductCatalog:
-    def __init__(self, api_token):
+    def __init__(self, api_token, request=None, models=False):
+        """
+        Keywords:
+            api_token (str): (required) BaseLinker API token.
+            request (Request): (optional) Shared transport, a new Request is created when omitted.
+            models (bool): (optional) Return product data as compact InventoryProduct models instead of dicts.
+        """
         self.api_token = api_token
-        self.request = Request(self.api_token)
+        self.models = models
+        self.request = request if request is not None else Request(self.api_token)
 
 
     def add_inventory_price_group(self, price_group_id, name, description, currency):
@@ -305,8 +322,49 @@ class ProductCatalog:
             by the get_inventories method (inventory_id field).
             products array (required) An array of product ID numbers to download
         """
-        return self.request.make_request('getInventoryProductsData', inventory_id=inventory_id, products=products)
+        response = self.request.make_request('getInventoryProductsData', inventory_id=inventory_id,
+                                             products=products)
+        return convert_response(response, 'products', InventoryProduct) if self.models else response
+
+
+    @sync_only
+    def stream_inventory_products_data(self, inventory_id, products):
+        """
+            Streaming variant of get_inventory_products_data. The response is parsed incrementally and
+            (product_id, product) pairs are yielded one at a time, so memory is bounded by a single product.
+        Keywords:
+            inventory_id int: (required) Catalog ID. The list of identifiers can be retrieved
+            by the get_inventories method (inventory_id field).
+            products array (required) An array of product ID numbers to download
+        """
+        pairs = self.request.stream_request('getInventoryProductsData', 'products', inventory_id=inventory_id,
+                                            products=products)
+        if not self.models:
+            return pairs
+        return ((product_id, InventoryProduct.from_dict(product, product_id)) for product_id, product in pairs)
 
+    @sync_only
+    def iter_inventory_products_data(self, inventory_id, products, chunk_size=INVENTORY_PRODUCTS_DATA_CHUNK_SIZE,
+                                     max_workers=4):
+        """
+            Bulk variant of get_inventory_products_data. Product IDs are split into chunks fetched concurrently,
+            results are yielded chunk by chunk in input order, so only a few chunks are held in memory.
+        Keywords:
+            inventory_id int: (required) Catalog ID. The list of identifiers can be retrieved
+            by the get_inventories method (inventory_id field).
+            products iterable (required) Product ID numbers to download, e.g. ids from iter_inventory_products.
+            chunk_size int (optional) Number of products requested in a single call, 100 by default.
+            max_workers int (optional) Number of chunks fetched concurrently, 4 by default.
+        Returns:
+            generator: (product_id, product) pairs.
+        Raises:
+            BaselinkerError: When the API returns an error response.
+        """
+        kwargs = ({'inventory_id': inventory_id, 'products': chunk} for chunk in chunked(products, chunk_size))
+        for result in run_batch(self.get_inventory_products_data, kwargs, max_workers=max_workers):
+            if result.error is not None:
+                raise result.error
+            yield from (get_records('getInventoryProductsData', result.result, 'products') or {}).items()
 
     def get_inventory_products_list(self, inventory_id, filter_id=None, filter_category_id=None,
                                     filter_ean=None, filter_sku=None, filter_name=None, filter_price_from=None,
@@ -335,6 +393,31 @@ class ProductCatalog:
                                          page=page, filter_sort=filter_sort)
 
 
+    @sync_only
+    def iter_inventory_products(self, inventory_id, pages_in_flight=2, **filters):
+        """
+            Lazily iterates over products of a catalog, paging through get_inventory_products_list.
+            Several pages are requested concurrently, the calls share the rate limiter of the client.
+        Keywords:
+            inventory_id int: (required) Catalog ID. The list of identifiers can be retrieved by the get_inventories method
+            pages_in_flight int (optional) Number of pages requested concurrently, 2 by default.
+            (**filters): Filters of get_inventory_products_list, e.g. filter_category_id or filter_sort.
+        Returns:
+            generator: Product dicts (id, ean, sku, name, stock, prices) in page order.
+        Raises:
+            BaselinkerError: When the API returns an error response.
+        """
+        def fetch_page(page):
+            response = self.get_inventory_products_list(inventory_id, page=page, **filters)
+            return get_records('getInventoryProductsList', response, 'products') or {}
+
+        def is_last_page(products):
+            return len(products) < INVENTORY_PRODUCTS_PAGE_SIZE
+
+        for _, products in iter_numbered_pages(fetch_page, is_last_page, pages_in_flight=pages_in_flight):
+            yield from products.values()
+
+
     def get_inventory_products_stock(self, inventory_id, page=None):
         """
             The method allows you to retrieve detailed data for selected products from the BaseLinker catalogue.
@@ -364,6 +447,32 @@ class ProductCatalog:
         return self.request.make_request('updateInventoryProductsStock', inventory_id=inventory_id, products=products)
 
 
+    @sync_only
+    def bulk_update_inventory_products_stock(self, inventory_id, products, chunk_size=STOCK_UPDATE_CHUNK_SIZE,
+                                             max_workers=4, checkpoint_path=None):
+        """
+            Updates stocks of any number of products with update_inventory_products_stock, sending chunks of
+            at most 1000 products concurrently under the rate limit of the client.
+        Keywords:
+            inventory_id int: (required) Catalog ID. The list of identifiers can be retrieved
+            by the get_inventories method
+            products dict|iterable (required) Stocks for each product ID, as a dict or (product_id, stocks) pairs.
+            The stocks format is the same as in update_inventory_products_stock.
+            chunk_size int (optional) Number of products sent in a single call, 1000 by default.
+            max_workers int (optional) Number of chunks sent concurrently, 4 by default.
+            checkpoint_path str (optional) Path of the JSON file recording finished chunks, a failed update
+            started again with the same products only sends the remaining chunks.
+        Returns:
+            report(dict): Total "counter", merged "warnings", number of "chunks" and "errors" mapping chunk
+            index to the exception or error response.
+        """
+        if isinstance(products, dict):
+            products = products.items()
+        return run_chunked(self.update_inventory_products_stock,
+                           lambda chunk: {'inventory_id': inventory_id, 'products': dict(chunk)},
+                           chunked(products, chunk_size), max_workers=max_workers, checkpoint_path=checkpoint_path,
+                           checkpoint_key=['updateInventoryProductsStock', inventory_id, chunk_size])
+
     def get_inventory_products_prices(self, inventory_id, page=None):
         """
             The method allows to retrieve the gross prices of products from BaseLinker catalogues.
@@ -389,6 +498,32 @@ class ProductCatalog:
         return self.request.make_request('updateInventoryProductsPrices', inventory_id=inventory_id, products=products)
 
 
+    @sync_only
+    def bulk_update_inventory_products_prices(self, inventory_id, products, chunk_size=PRICE_UPDATE_CHUNK_SIZE,
+                                              max_workers=4, checkpoint_path=None):
+        """
+            Updates prices of any number of products with update_inventory_products_prices, sending chunks of
+            at most 1000 products concurrently under the rate limit of the client.
+        Keywords:
+            inventory_id int: (required) Catalog ID. The list of identifiers can be retrieved
+            by the get_inventories method
+            products dict|iterable (required) Prices for each product ID, as a dict or (product_id, prices) pairs.
+            The prices format is the same as in update_inventory_products_prices.
+            chunk_size int (optional) Number of products sent in a single call, 1000 by default.
+            max_workers int (optional) Number of chunks sent concurrently, 4 by default.
+            checkpoint_path str (optional) Path of the JSON file recording finished chunks.
+        Returns:
+            report(dict): Total "counter", merged "warnings", number of "chunks" and "errors" mapping chunk
+            index to the exception or error response.
+        """
+        if isinstance(products, dict):
+            products = products.items()
+        return run_chunked(self.update_inventory_products_prices,
+                           lambda chunk: {'inventory_id': inventory_id, 'products': dict(chunk)},
+                           chunked(products, chunk_size), max_workers=max_workers, checkpoint_path=checkpoint_path,
+                           checkpoint_key=['updateInventoryProductsPrices', inventory_id, chunk_size])
+
+
     def get_inventory_product_logs(self, product_id, date_from=None, date_to=None, log_type=None, sort=None, page=None):
         """
             The method allows to retrieve a list of events related to product change (or their variants) in the BaseLinker catalog.
@@ -0,0 +1,138 @@
+import sqlite3
+import threading
+import time
+
+
+def _take(available, elapsed, tokens, fill_rate, burst):
+    """
+    Refills the bucket for elapsed seconds and takes tokens from it.
+    Returns:
+        (available, delay): Tokens left in the bucket and seconds to wait before sending the request.
+    """
+    available = min(burst, available + elapsed * fill_rate) - tokens
+    if available >= 0:
+        return available, 0.0
+    return available, -available / fill_rate
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to keep calls under the per-token API quota"""
+
+    def __init__(self, rate, per=60.0, burst=1):
+        """
+        Keywords:
+            rate (int): (required) Number of requests allowed per `per` seconds.
+            per (float): (optional) Length of the rate window in seconds, 60 by default.
+            burst (int): (optional) Number of requests that may be sent back to back, 1 by default.
+        """
+        if rate <= 0 or per <= 0:
+            raise ValueError('rate and per must be positive')
+        if burst < 1:
+            raise ValueError('burst must be at least 1')
+        self.rate = rate
+        self.per = per
+        self.burst = burst
+        self.__fill_rate = rate / per
+        self.__tokens = float(burst)
+        self.__updated_at = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        """
+        Method that takes tokens from the bucket without blocking.
+        Tokens may go below zero so concurrent callers are queued in arrival order.
+        Keywords:
+            tokens (int): (optional) Number of tokens to take, 1 by default.
+        Returns:
+            delay(float): Number of seconds the caller has to wait before sending the request.
+        """
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens, delay = _take(self.__tokens, now - self.__updated_at, tokens, self.__fill_rate,
+                                         self.burst)
+            self.__updated_at = now
+            return delay
+
+    def acquire(self, tokens=1):
+        """
+        Method that blocks until tokens are available.
+        Keywords:
+            tokens (int): (optional) Number of tokens to take, 1 by default.
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class SqliteTokenBucket:
+    """Token bucket stored in a sqlite file, shared by every process using the same path and key"""
+
+    def __init__(self, path, rate, per=60.0, burst=1, key='default', timeout=30.0):
+        """
+        Keywords:
+            path (str): (required) Path to the sqlite database file, created when missing.
+            rate (int): (required) Number of requests allowed per `per` seconds for all processes together.
+            per (float): (optional) Length of the rate window in seconds, 60 by default.
+            burst (int): (optional) Number of requests that may be sent back to back, 1 by default.
+            key (str): (optional) Bucket name, use a separate key for each API token.
+            timeout (float): (optional) Seconds to wait for the database lock held by another process.
+        """
+        if rate <= 0 or per <= 0:
+            raise ValueError('rate and per must be positive')
+        if burst < 1:
+            raise ValueError('burst must be at least 1')
+        self.path = path
+        self.rate = rate
+        self.per = per
+        self.burst = burst
+        self.key = key
+        self.timeout = timeout
+        self.__fill_rate = rate / per
+        connection = self.__connect()
+        try:
+            connection.execute('CREATE TABLE IF NOT EXISTS token_buckets '
+                               '(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)')
+        finally:
+            connection.close()
+
+    def __connect(self):
+        # A connection per call keeps the bucket safe to use after fork and from many threads.
+        return sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+
+    def reserve(self, tokens=1):
+        """
+        Method that takes tokens from the shared bucket without blocking.
+        The read-modify-write runs inside an exclusive sqlite transaction, so processes are serialized.
+        Keywords:
+            tokens (int): (optional) Number of tokens to take, 1 by default.
+        Returns:
+            delay(float): Number of seconds the caller has to wait before sending the request.
+        """
+        connection = self.__connect()
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+            now = time.time()
+            row = connection.execute('SELECT tokens, updated_at FROM token_buckets WHERE key = ?',
+                                     (self.key,)).fetchone()
+            available, updated_at = row if row else (float(self.burst), now)
+            available, delay = _take(available, max(0.0, now - updated_at), tokens, self.__fill_rate, self.burst)
+            connection.execute('INSERT OR REPLACE INTO token_buckets (key, tokens, updated_at) VALUES (?, ?, ?)',
+                               (self.key, available, now))
+            connection.execute('COMMIT')
+            return delay
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+            raise
+        finally:
+            connection.close()
+
+    def acquire(self, tokens=1):
+        """
+        Method that blocks until tokens are available.
+        Keywords:
+            tokens (int): (optional) Number of tokens to take, 1 by default.
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
@@ -0,0 +1,243 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+
+from .pagination import BaselinkerError, get_records
+
+# Number of confirmations appended to the record before it is compacted.
+COMPACT_AFTER = 1000
+
+
+class ReceiptPoller:
+    """
+    Long-running fiscal printer integration built on get_new_receipts and set_order_receipt.
+    All numbering series are polled concurrently. The interval drops to min_interval while receipts are
+    flowing and grows up to max_interval when idle. Every printed receipt is appended to a durable record
+    before it is confirmed, so after a crash it is confirmed again instead of being printed twice.
+    Confirmations are sent in the background while the next receipts are printed. A confirmed receipt is
+    dropped from the record once a poll sent after its confirmation no longer returns it, and the record is
+    compacted on start and after every COMPACT_AFTER dropped receipts.
+    """
+
+    def __init__(self, orders, print_receipt, record_path, series_ids=(None,), min_interval=1.0, max_interval=10.0,
+                 backoff=2.0, max_workers=4, max_errors=100):
+        """
+        Keywords:
+            orders (Orders): (required) Orders client.
+            print_receipt (callable): (required) Function printing a receipt dict and returning its number
+            (may be empty if the printer does not return the number). Exceptions are reported to BaseLinker
+            with printer_error set.
+            record_path (str): (required) Path of the append-only file recording printed receipts.
+            series_ids (iterable): (optional) Numbering series to poll, one per fiscal printer. All series by default.
+            min_interval (float): (optional) Seconds between polls while receipts are flowing.
+            max_interval (float): (optional) Longest interval between polls when idle, 10 seconds by default.
+            backoff (float): (optional) Factor by which the interval grows after an idle poll.
+            max_workers (int): (optional) Number of threads polling series and sending confirmations.
+            max_errors (int): (optional) Number of most recent errors kept in errors, 100 by default.
+        """
+        if not 0 < min_interval <= max_interval:
+            raise ValueError('min_interval must be positive and not greater than max_interval')
+        self.orders = orders
+        self.print_receipt = print_receipt
+        self.record_path = record_path
+        self.series_ids = list(series_ids)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self.__lock = threading.Lock()
+        self.__confirmed_since_compaction = 0
+        # Poll counter and the poll count at which each receipt was confirmed.
+        self.__generation = 0
+        self.__confirmed = {}
+        self.printed = self.__load_record()
+        self.errors = deque(maxlen=max_errors)
+        self.__confirming = set()
+        self.__confirmations = set()
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def __load_record(self):
+        printed = {}
+        try:
+            with open(self.record_path, 'rb') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A crash while appending leaves a partial last line, the rewrite below drops it.
+                        break
+                    if entry.get('confirmed'):
+                        printed.pop(entry['receipt_id'], None)
+                    else:
+                        printed[entry['receipt_id']] = entry
+        except FileNotFoundError:
+            return printed
+        self.__rewrite_record(printed)
+        return printed
+
+    def __rewrite_record(self, printed):
+        directory = os.path.dirname(os.path.abspath(self.record_path))
+        descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix='.receipts-')
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+                for entry in printed.values():
+                    file.write(json.dumps(entry) + '\n')
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary_path, self.record_path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    def __append_record(self, entry):
+        with open(self.record_path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(entry) + '\n')
+            file.flush()
+            os.fsync(file.fileno())
+
+    def __record(self, entry):
+        with self.__lock:
+            self.__append_record(entry)
+            self.printed[entry['receipt_id']] = entry
+
+    def __forget(self, receipt_id):
+        # Called with the lock held.
+        self.__confirmed.pop(receipt_id, None)
+        if self.printed.pop(receipt_id, None) is None:
+            return
+        self.__append_record({'receipt_id': receipt_id, 'confirmed': True})
+        self.__confirmed_since_compaction += 1
+        if self.__confirmed_since_compaction >= COMPACT_AFTER:
+            self.__rewrite_record(self.printed)
+            self.__confirmed_since_compaction = 0
+
+    def __confirm(self, entry):
+        confirmed = False
+        try:
+            response = self.orders.set_order_receipt(receipt_id=entry['receipt_id'], receipt_nr=entry['receipt_nr'],
+                                                     date=entry['date'], printer_error=entry.get('printer_error'))
+            if response.get('status') == 'ERROR':
+                self.errors.append((entry['receipt_id'], response))
+            else:
+                confirmed = True
+        except Exception as e:
+            self.errors.append((entry['receipt_id'], e))
+        finally:
+            with self.__lock:
+                if confirmed:
+                    # Polls already in flight may still return the receipt, it is kept until a poll
+                    # started after this point no longer does.
+                    self.__confirmed[entry['receipt_id']] = self.__generation
+                self.__confirming.discard(entry['receipt_id'])
+
+    def __submit_confirmation(self, entry):
+        with self.__lock:
+            self.__confirming.add(entry['receipt_id'])
+            self.__confirmed.pop(entry['receipt_id'], None)
+        future = self.__executor.submit(self.__confirm, entry)
+        with self.__lock:
+            self.__confirmations.add(future)
+        future.add_done_callback(self.__confirmation_done)
+
+    def __confirmation_done(self, future):
+        with self.__lock:
+            self.__confirmations.discard(future)
+
+    def wait_for_confirmations(self, timeout=None):
+        """
+            Waits until confirmations queued so far have been sent.
+        Keywords:
+            timeout (float): (optional) Maximum number of seconds to wait.
+        """
+        with self.__lock:
+            pending = list(self.__confirmations)
+        wait(pending, timeout=timeout)
+
+    def __handle(self, receipt, generation):
+        receipt_id = receipt['receipt_id']
+        with self.__lock:
+            if receipt_id in self.__confirming:
+                return False
+            confirmed_at = self.__confirmed.get(receipt_id)
+            if confirmed_at is not None and confirmed_at >= generation:
+                # The poll was sent before the confirmation reached BaseLinker.
+                return False
+            entry = self.printed.get(receipt_id)
+        if entry is not None:
+            self.__submit_confirmation(entry)
+            return False
+        if confirmed_at is not None:
+            # Printer error already reported and still listed by a later poll, it is not printed again.
+            return False
+        try:
+            entry = {'receipt_id': receipt_id, 'receipt_nr': self.print_receipt(receipt) or '',
+                     'date': int(time.time())}
+            self.__record(entry)
+        except Exception as e:
+            self.errors.append((receipt_id, e))
+            entry = {'receipt_id': receipt_id, 'receipt_nr': '', 'date': int(time.time()), 'printer_error': True}
+        self.__submit_confirmation(entry)
+        return True
+
+    def __forget_settled(self, generation, receipt_ids):
+        with self.__lock:
+            settled = [receipt_id for receipt_id, confirmed_at in self.__confirmed.items()
+                       if confirmed_at < generation and receipt_id not in receipt_ids]
+            for receipt_id in settled:
+                self.__forget(receipt_id)
+
+    def poll_once(self):
+        """
+            Polls every series once, prints new receipts and queues their confirmations.
+            Confirmed receipts are dropped from the record once a poll sent after the confirmation
+            no longer returns them. The interval is adjusted to the number of receipts found.
+        Returns:
+            count(int): Number of receipts printed.
+        """
+        with self.__lock:
+            self.__generation += 1
+            generation = self.__generation
+        futures = [self.__executor.submit(self.orders.get_new_receipts, series_id=series_id)
+                   for series_id in self.series_ids]
+        receipts = []
+        for future in futures:
+            receipts.extend(get_records('getNewReceipts', future.result(), 'receipts'))
+        printed = sum(self.__handle(receipt, generation) for receipt in receipts)
+        self.__forget_settled(generation, {receipt['receipt_id'] for receipt in receipts})
+        if receipts:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+        return printed
+
+    def run(self, stop_event=None):
+        """
+            Polls until stop_event is set, then waits for queued confirmations. Failed polls are recorded
+            in errors and retried after a longer interval.
+        Keywords:
+            stop_event (threading.Event): (optional) Event stopping the loop.
+        """
+        stop_event = stop_event or threading.Event()
+        try:
+            while not stop_event.is_set():
+                try:
+                    self.poll_once()
+                except (requests.RequestException, BaselinkerError) as e:
+                    # The API is unavailable or rejected the poll, keep running and poll less often.
+                    self.errors.append((None, e))
+                    self.interval = min(self.max_interval, self.interval * self.backoff)
+                stop_event.wait(self.interval)
+        finally:
+            self.close()
+
+    def close(self):
+        """
+            Waits for queued confirmations and stops worker threads.
+        """
+        self.__executor.shutdown(wait=True)
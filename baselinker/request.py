@@ -1,15 +1,108 @@
-import json
+import base64
+import time
+from urllib.parse import quote_plus
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from .json_codec import get_codec
+from .json_stream import MissingMemberError, iter_member
+
+
+class _Null:
+    """Sentinel sending an explicit null, parameters set to None are left out of the request"""
+
+    def __repr__(self):
+        return 'NULL'
+
+
+NULL = _Null()
+
+
+class _Base64FormBody:
+    """
+    Iterable form body with one parameter holding a file encoded in base64. The file is read and encoded
+    in chunks while the body is sent. Seekable files are rewound on every iteration, so requests can be retried.
+    """
+
+    # Multiple of 3 bytes, so each chunk encodes to base64 without padding.
+    chunk_size = 3 * 64 * 1024
+
+    def __init__(self, prefix, file, suffix):
+        self.prefix = prefix
+        self.file = file
+        self.suffix = suffix
+        self.seekable = hasattr(file, 'seekable') and file.seekable()
+        self.start = file.tell() if self.seekable else None
+        self.iterated = False
+
+    def __iter__(self):
+        if self.seekable:
+            self.file.seek(self.start)
+        elif self.iterated:
+            raise ValueError('Request body of a non-seekable file can be sent only once')
+        self.iterated = True
+        yield self.prefix
+        while True:
+            chunk = self.file.read(self.chunk_size)
+            if not chunk:
+                break
+            # Base64 alphabet needs escaping of "+", "/" and "=" only in urlencoded body.
+            yield base64.b64encode(chunk).replace(b'+', b'%2B').replace(b'/', b'%2F').replace(b'=', b'%3D')
+        yield self.suffix
 
 
 class Request:
 
-    def __init__(self, api_token):
+    def __init__(self, api_token, pool_connections=10, pool_maxsize=10, max_retries=0, keep_alive=True,
+                 rate_limiter=None, retry_policy=None, codec=None):
+        """
+        Keywords:
+            api_token (str): (required) BaseLinker API token.
+            pool_connections (int): (optional) Number of connection pools to cache.
+            pool_maxsize (int): (optional) Maximum number of connections kept alive in the pool.
+            max_retries (int): (optional) Number of retries on failed connection attempts made by the adapter.
+            keep_alive (bool): (optional) Keep connections open between requests, true by default.
+            rate_limiter (TokenBucket): (optional) Limiter acquired before every request, no limit by default.
+            retry_policy (RetryPolicy): (optional) Policy used to retry transient failures, no retries by default.
+            codec (str|object): (optional) JSON codec name ("orjson", "ujson", "json") or object with dumps and loads.
+            The fastest installed codec is used by default.
+        """
         self.api_url = 'https://api.baselinker.com/connector.php'
         if not api_token:
             raise ValueError('api_key must be set! Obtain key from: https://panel.baselinker.com/other_api_token.php')
         self.api_token = api_token
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.codec = codec if codec is not None and not isinstance(codec, str) else get_codec(codec)
+        self.session = self.__create_session(pool_connections, pool_maxsize, max_retries, keep_alive)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def __create_session(pool_connections, pool_maxsize, max_retries, keep_alive):
+        """
+        Method that creates long-lived session reused by every request
+        Returns:
+            session(requests.Session): Session with pooled adapter mounted for https.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                              max_retries=max_retries)
+        session.mount('https://', adapter)
+        if not keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def close(self):
+        """
+        Method that closes the session and all pooled connections.
+        """
+        self.session.close()
 
     def __get_request_data(self, method_name, parameters=None):
         """
@@ -17,12 +110,16 @@ class Request:
         Keywords:
             method_name (str): (required) Name of the method to invoke.
             parameters (dict): (optional) Dictionary of parameters specified by user.
+            Parameters set to None are skipped, use NULL to send an explicit null.
         Returns:
             request_data(json): Data used inside body of request returned as a json string.
         """
         request_data = {'method': method_name}
         if parameters:
-            request_data['parameters'] = json.dumps(parameters)
+            parameters = {key: None if value is NULL else value
+                          for key, value in parameters.items() if value is not None}
+        if parameters:
+            request_data['parameters'] = self.codec.dumps(parameters)
         return request_data
 
     def __get_request_headers(self):
@@ -34,6 +131,54 @@ class Request:
         headers = {'X-BLToken': self.api_token}
         return headers
 
+    def _prepare_request(self, method_name, parameters=None):
+        """
+        Method that builds body and headers shared by sync and async transports.
+        Returns:
+            (request_data, headers): Form data and headers of the request.
+        """
+        return self.__get_request_data(method_name, parameters), self.__get_request_headers()
+
+    def _decode_content(self, content):
+        """
+        Method that decodes raw response body.
+        Keywords:
+            content (bytes): (required) Body of the response.
+        Returns:
+            content(json): Decoded response.
+        """
+        return self.codec.loads(content)
+
+    def __send(self, method_name, requests_data, headers, attempt=1, **options):
+        """
+        Method that posts request data, retrying connection errors and transient HTTP status codes.
+        Keywords:
+            method_name (str): (required) Name of the invoked method.
+            requests_data (dict): (required) Body of the request.
+            headers (dict): (required) Headers of the request.
+            attempt (int): (optional) Number of the first attempt.
+            (**options): Extra keyword arguments passed to session.post, e.g. stream.
+        Returns:
+            (response, attempt): Response and number of the attempt that produced it.
+        """
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                response = self.session.post(self.api_url, data=requests_data, headers=headers, **options)
+            except requests.RequestException as e:
+                delay = self._get_retry_delay(method_name, attempt, exception=e)
+                if delay is None:
+                    print(e)
+                    raise e
+            else:
+                delay = self._get_retry_delay(method_name, attempt, status_code=response.status_code)
+                if delay is None:
+                    return response, attempt
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
     def make_request(self, method_name, **kwargs):
         """
         Method that sends request to api endpoint.
@@ -43,14 +188,93 @@ class Request:
         Returns:
             content(json): Method returns content of the response formatted as json string.
         """
-        requests_data = self.__get_request_data(method_name, kwargs)
-        headers = self.__get_request_headers()
-        try:
-            with requests.Session() as s:
-                response = s.post(self.api_url, data=requests_data, headers=headers)
-                content = json.loads(response.content.decode("utf-8"))
+        requests_data, headers = self._prepare_request(method_name, kwargs)
+        return self.__request(method_name, requests_data, headers)
+
+    def __request(self, method_name, requests_data, headers):
+        """
+        Method that sends request data and decodes the response, retrying throttled calls.
+        Returns:
+            content(json): Decoded response.
+        """
+        attempt = 1
+        while True:
+            response, attempt = self.__send(method_name, requests_data, headers, attempt)
+            content = self._decode_content(response.content)
+            delay = self._get_retry_delay(method_name, attempt, content=content)
+            if delay is None:
                 return content
+            time.sleep(delay)
+            attempt += 1
+
+    def upload_request(self, method_name, file_parameter, file, **kwargs):
+        """
+        Method that sends request with a binary file encoded as a base64 "data:" string parameter.
+        The file is encoded in chunks into a streamed request body, so it is never held in memory whole.
+        Keywords:
+            method_name (str): (required) Name of the method to invoke.
+            file_parameter (str): (required) Name of the parameter holding the file.
+            file (file object): (required) Binary file object opened for reading.
+            (**kwargs): (required) Other parameters specified by user.
+        Returns:
+            content(json): Method returns content of the response formatted as json string.
+        """
+        requests_data, headers = self._prepare_request(method_name, kwargs)
+        parameters = requests_data.get('parameters', '{}')[:-1]
+        separator = ',' if parameters != '{' else ''
+        prefix = 'method={}&parameters={}'.format(
+            quote_plus(method_name), quote_plus('{}{}"{}":"data:'.format(parameters, separator, file_parameter)))
+        body = _Base64FormBody(prefix.encode('ascii'), file, quote_plus('"}').encode('ascii'))
+        headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        return self.__request(method_name, body, headers)
 
-        except requests.RequestException as e:
-            print(e)
-            raise e
+    def stream_request(self, method_name, member, chunk_size=65536, **kwargs):
+        """
+        Method that sends request to api endpoint and parses the response incrementally.
+        Memory use is bounded by a single record instead of the whole response.
+        The request is sent when iteration starts. Throttling error responses are retried the same way
+        as in make_request, before any record is yielded.
+        Keywords:
+            method_name (str): (required) Name of the method to invoke.
+            member (str): (required) Top-level member of the response to iterate, e.g. "products" or "orders".
+            chunk_size (int): (optional) Number of bytes read from the socket at a time.
+            (**kwargs): (required) Parameters specified by user.
+        Returns:
+            generator: (key, record) pairs when the member is an object, records when it is an array.
+        Raises:
+            ValueError: When the response has no such member and is not retried, e.g. for error responses.
+        """
+        requests_data, headers = self._prepare_request(method_name, kwargs)
+        attempt = 1
+        while True:
+            response, attempt = self.__send(method_name, requests_data, headers, attempt, stream=True)
+            with response:
+                try:
+                    yield from iter_member(response.iter_content(chunk_size), member, self.codec.loads)
+                    return
+                except MissingMemberError as e:
+                    # Nothing has been yielded yet, so a throttled request can be sent again.
+                    delay = self._get_retry_delay(method_name, attempt, content=e.content)
+                    if delay is None:
+                        raise
+            time.sleep(delay)
+            attempt += 1
+
+    def _get_retry_delay(self, method_name, attempt, **failure):
+        """
+        Method that decides whether a failed attempt should be retried.
+        Keywords:
+            method_name (str): (required) Name of the invoked method.
+            attempt (int): (required) Number of the attempt that failed, starting from 1.
+            (**failure): exception, status_code or content describing the attempt.
+        Returns:
+            delay(float): Seconds to wait before the next attempt or None when the request should not be retried.
+        """
+        policy = self.retry_policy
+        if policy is None or attempt >= policy.max_attempts:
+            return None
+        reason = policy.get_retry_reason(method_name, **failure)
+        if reason is None:
+            return None
+        policy.record(method_name, reason)
+        return policy.get_delay(attempt)
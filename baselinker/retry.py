@@ -0,0 +1,95 @@
+import random
+import threading
+from collections import Counter
+
+import requests
+
+IDEMPOTENT_WRITE_METHODS = frozenset({
+    'setOrderFields',
+    'setOrderStatus',
+    'setOrderPayment',
+    'setOrderProductFields',
+    'updateInventoryProductsStock',
+    'updateInventoryProductsPrices',
+    'updateExternalStorageProductsQuantity',
+})
+
+THROTTLING_ERROR_CODES = frozenset({
+    'ERROR_BLOCKED_TOKEN',
+    'ERROR_TOO_MANY_REQUESTS',
+})
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for transient errors and throttling responses"""
+
+    def __init__(self, max_attempts=5, backoff_base=1.0, backoff_max=60.0, retry_methods=IDEMPOTENT_WRITE_METHODS,
+                 retry_status_codes=RETRY_STATUS_CODES, throttling_error_codes=THROTTLING_ERROR_CODES):
+        """
+        Keywords:
+            max_attempts (int): (optional) Maximum number of attempts including the first one, 5 by default.
+            backoff_base (float): (optional) Delay in seconds before the first retry, doubled on each attempt.
+            backoff_max (float): (optional) Upper bound of a single delay in seconds.
+            retry_methods (set): (optional) Write methods safe to retry after connection errors and 5xx responses.
+            Methods starting with "get" are always retried, throttled calls are retried for every method
+            because the server rejected them without executing.
+            retry_status_codes (set): (optional) HTTP status codes treated as transient.
+            throttling_error_codes (set): (optional) BaseLinker error_code values treated as throttling.
+        """
+        if max_attempts < 1:
+            raise ValueError('max_attempts must be at least 1')
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_methods = frozenset(retry_methods)
+        self.retry_status_codes = frozenset(retry_status_codes)
+        self.throttling_error_codes = frozenset(throttling_error_codes)
+        self.retries_by_method = Counter()
+        self.retries_by_reason = Counter()
+        self.__lock = threading.Lock()
+
+    @property
+    def total_retries(self):
+        return sum(self.retries_by_reason.values())
+
+    def is_retryable_method(self, method_name):
+        return method_name.startswith('get') or method_name in self.retry_methods
+
+    def get_retry_reason(self, method_name, exception=None, status_code=None, content=None):
+        """
+        Method that classifies a failed attempt.
+        Keywords:
+            method_name (str): (required) Name of the invoked API method.
+            exception (Exception): (optional) Exception raised while sending the request.
+            status_code (int): (optional) HTTP status code of the response.
+            content (dict): (optional) Decoded response body.
+        Returns:
+            reason(str): Reason the call should be retried or None when it should not.
+        """
+        if isinstance(content, dict) and content.get('status') == 'ERROR' \
+                and content.get('error_code') in self.throttling_error_codes:
+            return content['error_code']
+        if not self.is_retryable_method(method_name):
+            return None
+        if isinstance(exception, (requests.ConnectionError, requests.Timeout)):
+            return type(exception).__name__
+        if status_code in self.retry_status_codes:
+            return 'HTTP {}'.format(status_code)
+        return None
+
+    def get_delay(self, attempt):
+        """
+        Method that returns backoff delay for a given attempt.
+        Keywords:
+            attempt (int): (required) Number of the failed attempt, starting from 1.
+        Returns:
+            delay(float): Random delay between 0 and the capped exponential backoff.
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def record(self, method_name, reason):
+        with self.__lock:
+            self.retries_by_method[method_name] += 1
+            self.retries_by_reason[reason] += 1
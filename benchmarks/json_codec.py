@@ -0,0 +1,63 @@
+"""
+Compares decoding a large getInventoryProductsData response with the available JSON codecs.
+Run with: python benchmarks/json_codec.py
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from baselinker.json_codec import CODECS, get_codec  # noqa: E402
+
+
+def product(product_id):
+    return {
+        'is_bundle': False,
+        'ean': '59{:011d}'.format(product_id),
+        'sku': 'SKU-{}'.format(product_id),
+        'tax_rate': 23,
+        'weight': 0.25,
+        'height': 10, 'width': 20, 'length': 5,
+        'star': 0,
+        'category_id': 3 + product_id % 40,
+        'manufacturer_id': 7,
+        'prices': {'105': 39.99, '106': 9.5},
+        'stock': {'bl_206': product_id % 17, 'bl_207': 4},
+        'locations': {'bl_206': 'A1-13-7'},
+        'text_fields': {
+            'name': 'Zestaw narzędzi warsztatowych {}'.format(product_id),
+            'description': '<p>Solidny zestaw narzędzi. Wytrzymała stal chromowo-wanadowa.</p>' * 8,
+            'features': {'Kolor': 'czerwony', 'Materiał': 'stal', 'Waga': '2,5 kg'},
+            'description_extra1': '',
+        },
+        'average_cost': 21.3,
+        'images': {str(i): 'https://upload.cdn.baselinker.com/products/{}/{}.jpg'.format(product_id, i)
+                   for i in range(1, 5)},
+        'links': {'shop_9000': {'product_id': product_id, 'variant_id': 0}},
+        'variants': {str(product_id * 10 + i): {'name': 'Rozmiar {}'.format(i),
+                                                'sku': 'SKU-{}-{}'.format(product_id, i), 'ean': '',
+                                                'prices': {'105': 39.99}, 'stock': {'bl_206': i}}
+                     for i in range(3)},
+    }
+
+
+def run():
+    response = json.dumps({'status': 'SUCCESS', 'products': {str(i): product(i) for i in range(1000)}},
+                          ensure_ascii=False).encode('utf-8')
+    print('payload: {:.1f} MB, 1000 products'.format(len(response) / 1024 / 1024))
+    timings = {'json (decode + loads, before)': lambda: json.loads(response.decode('utf-8'))}
+    for name in CODECS:
+        try:
+            codec = get_codec(name)
+        except ImportError:
+            continue
+        timings['{} (loads bytes)'.format(name)] = lambda codec=codec: codec.loads(response)
+    for name, func in timings.items():
+        best = min(timeit.repeat(func, number=5, repeat=5)) / 5
+        print('{:<32} {:8.1f} ms'.format(name, best * 1000))
+
+
+if __name__ == '__main__':
+    run()
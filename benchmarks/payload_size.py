@@ -0,0 +1,44 @@
+"""
+Compares request body size with and without None-valued parameters.
+Run with: python benchmarks/payload_size.py
+"""
+import json
+import os
+import sys
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from baselinker import Request  # noqa: E402
+from baselinker.external_storages import ExternalStorages  # noqa: E402
+from baselinker.orders import Orders  # noqa: E402
+
+
+class CapturingRequest(Request):
+
+    def make_request(self, method_name, **kwargs):
+        self.captured = method_name, kwargs
+
+
+def body_size(request_data):
+    return len(urlencode(request_data).encode('utf-8'))
+
+
+def run():
+    request = CapturingRequest('token')
+    calls = [
+        (Orders('token', request=request).set_order_fields, {'order_id': 1630473, 'admin_comments': 'Checked'}),
+        (Orders('token', request=request).get_orders, {'date_confirmed_from': 1407841256}),
+        (ExternalStorages('token', request=request).get_external_storage_products_list, {'storage_id': 'shop_2445'}),
+    ]
+    print('{:<40} {:>10} {:>10} {:>8}'.format('method', 'before [B]', 'after [B]', 'saved'))
+    for method, kwargs in calls:
+        method(**kwargs)
+        method_name, parameters = request.captured
+        before = body_size({'method': method_name, 'parameters': json.dumps(parameters)})
+        after = body_size(request._prepare_request(method_name, parameters)[0])
+        print('{:<40} {:>10} {:>10} {:>7.0%}'.format(method_name, before, after, 1 - after / before))
+
+
+if __name__ == '__main__':
+    run()
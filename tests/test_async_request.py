@@ -0,0 +1,116 @@
+import pathlib
+import unittest
+from unittest.mock import MagicMock, patch
+import requests
+from baselinker import AsyncBaselinker, AsyncRequest, RetryPolicy
+
+
+@patch('baselinker.async_request.aiohttp', None)
+class TestAsyncRequest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.api_token = 'my_token'
+        self.request = AsyncRequest(api_token=self.api_token)
+
+    @patch('requests.Session.post')
+    async def test_make_request_success(self, mock_post):
+        mock_post.return_value = MagicMock(status_code=200, content=b'{"status": "SUCCESS"}')
+
+        response = await self.request.make_request('getOrders', order_id=1)
+
+        mock_post.assert_called_once_with(self.request.api_url,
+                                          data={'method': 'getOrders', 'parameters': '{"order_id":1}'},
+                                          headers={'X-BLToken': self.api_token})
+        self.assertEqual(response, {'status': 'SUCCESS'})
+
+    @patch('baselinker.async_request.asyncio.sleep')
+    @patch('requests.Session.post')
+    async def test_make_request_retries_and_uses_rate_limiter(self, mock_post, mock_sleep):
+        rate_limiter = MagicMock()
+        rate_limiter.reserve.return_value = 0.5
+        request = AsyncRequest(api_token=self.api_token, rate_limiter=rate_limiter,
+                               retry_policy=RetryPolicy(max_attempts=2))
+        mock_post.side_effect = [requests.ConnectionError('reset'),
+                                 MagicMock(status_code=200, content=b'{"status": "SUCCESS"}')]
+
+        response = await request.make_request('getOrders')
+
+        self.assertEqual(response, {'status': 'SUCCESS'})
+        self.assertEqual(rate_limiter.reserve.call_count, 2)
+        mock_sleep.assert_any_call(0.5)
+
+    @patch('requests.Session.post', side_effect=requests.ConnectionError('reset'))
+    async def test_make_request_failure(self, mock_post):
+        with self.assertRaises(requests.ConnectionError):
+            await self.request.make_request('getOrders')
+
+    @patch('requests.Session.close')
+    async def test_async_context_manager_closes_session(self, mock_close):
+        async with AsyncRequest(api_token=self.api_token):
+            pass
+        mock_close.assert_called_once()
+
+
+class TestAsyncBaselinker(unittest.IsolatedAsyncioTestCase):
+
+    async def test_sub_clients_return_awaitables(self):
+        client = AsyncBaselinker(api_token='my_token', requests_per_minute=None)
+        self.assertIsInstance(client.request, AsyncRequest)
+        self.assertIs(client.orders.request, client.request)
+        with patch.object(AsyncRequest, 'make_request') as mock_make_request:
+            async def make_request(method_name, **kwargs):
+                return {'status': 'SUCCESS', 'method': method_name}
+            mock_make_request.side_effect = make_request
+
+            response = await client.orders.get_orders(order_id=1)
+
+        self.assertEqual(response['method'], 'getOrders')
+        await client.aclose()
+
+    async def test_bulk_helpers_are_refused(self):
+        client = AsyncBaselinker(api_token='my_token', requests_per_minute=None)
+        with patch.object(AsyncRequest, 'make_request') as mock_make_request:
+            with self.assertRaises(TypeError):
+                client.orders.set_order_statuses({1: 2})
+            with self.assertRaises(TypeError):
+                client.orders.update_orders_if_changed([({'order_id': 1}, {'admin_comments': 'x'})])
+            with self.assertRaises(TypeError):
+                client.orders.add_order_invoice_files([])
+            with self.assertRaises(TypeError):
+                client.product_catalog.bulk_update_inventory_products_stock(1, {1: {'bl_1': 5}})
+            with self.assertRaises(TypeError):
+                client.product_catalog.bulk_update_inventory_products_prices(1, {1: {'105': 5}})
+            with self.assertRaises(TypeError):
+                client.external_storages.bulk_update_external_storage_products_quantity('shop_1', [])
+        mock_make_request.assert_not_called()
+        await client.aclose()
+
+    async def test_sync_only_helpers_are_refused(self):
+        client = AsyncBaselinker(api_token='my_token', requests_per_minute=None)
+        with patch.object(AsyncRequest, 'make_request') as mock_make_request:
+            with self.assertRaises(TypeError):
+                client.orders.iter_orders()
+            with self.assertRaises(TypeError):
+                client.orders.iter_invoices()
+            with self.assertRaises(TypeError):
+                client.orders.update_order_if_changed({'order_id': 1}, admin_comments='x')
+            with self.assertRaises(TypeError):
+                client.orders.add_order_invoice_file(1, pathlib.Path('invoice.pdf'), 'FV 1')
+            with self.assertRaises(TypeError):
+                client.product_catalog.iter_inventory_products(1)
+            with self.assertRaises(TypeError):
+                client.product_catalog.iter_inventory_products_data(1, [1])
+            with self.assertRaises(TypeError):
+                client.map('get_orders', [{}])
+        mock_make_request.assert_not_called()
+        await client.aclose()
+
+    async def test_invoice_file_as_string_is_awaitable(self):
+        client = AsyncBaselinker(api_token='my_token', requests_per_minute=None)
+        with patch.object(AsyncRequest, 'make_request') as mock_make_request:
+            async def make_request(method_name, **kwargs):
+                return {'status': 'SUCCESS'}
+            mock_make_request.side_effect = make_request
+            response = await client.orders.add_order_invoice_file(1, 'data:JVBERi0=', 'FV 1')
+        self.assertEqual(response, {'status': 'SUCCESS'})
+        await client.aclose()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+from baselinker import OrderBackfill
+from baselinker.orders import Orders
+from tests.test_orders import FakeOrdersApi
+
+
+class TestOrderBackfill(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeOrdersApi([{'order_id': order_id, 'date_confirmed': 1000 + order_id // 3}
+                                  for order_id in range(1, 1201)])
+        self.orders = Orders('my_token', request=self.api)
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.directory.name, 'backfill.json')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_partitions_cover_range(self):
+        backfill = OrderBackfill(self.orders, date_from=1000, date_to=1250, partition_seconds=100)
+        self.assertEqual(backfill.partitions, [(1000, 1100), (1100, 1200), (1200, 1250)])
+
+    def test_invalid_range(self):
+        with self.assertRaises(ValueError):
+            OrderBackfill(self.orders, date_from=1000, date_to=1000)
+
+    def test_backfill_yields_ordered_unique_orders(self):
+        backfill = OrderBackfill(self.orders, date_from=1000, date_to=1401, partition_seconds=50, max_workers=3)
+        result = [order['order_id'] for order in backfill]
+        self.assertEqual(result, list(range(1, 1201)))
+
+    def test_backfill_resumes_from_checkpoint(self):
+        backfill = OrderBackfill(self.orders, date_from=1000, date_to=1401, partition_seconds=100,
+                                 max_workers=2, checkpoint_path=self.checkpoint_path)
+        iterator = iter(backfill)
+        consumed = [next(iterator)['order_id'] for _ in range(400)]
+        iterator.close()
+
+        resumed = OrderBackfill(self.orders, date_from=1000, date_to=1401, partition_seconds=100,
+                                max_workers=2, checkpoint_path=self.checkpoint_path)
+        self.assertEqual(resumed.completed, {1000})
+        result = [order['order_id'] for order in resumed]
+        self.assertEqual(result[0], 300)
+        self.assertEqual(sorted(set(consumed) | set(result)), list(range(1, 1201)))
+
+    def test_checkpoint_of_different_backfill(self):
+        OrderBackfill(self.orders, date_from=1000, date_to=1401, partition_seconds=100,
+                      checkpoint_path=self.checkpoint_path)._OrderBackfill__mark_completed(1000)
+        with self.assertRaises(ValueError):
+            OrderBackfill(self.orders, date_from=1000, date_to=1500, checkpoint_path=self.checkpoint_path)
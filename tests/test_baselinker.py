@@ -22,3 +22,52 @@ class TestBaselinker(unittest.TestCase):
         self.assertIsInstance(self.baselinker.orders, MagicMock)
         self.assertIsInstance(self.baselinker.external_storages, MagicMock)
         self.assertIsInstance(self.baselinker.product_catalog, MagicMock)
+
+    def test_context_manager_closes_requests(self):
+        with self.baselinker as client:
+            self.assertIs(client, self.baselinker)
+        self.request_mock.close.assert_called_once()
+
+    def test_sub_clients_share_one_request(self):
+        baselinker = Baselinker(api_token='my_token')
+        self.assertIs(baselinker.orders.request, baselinker.request)
+        self.assertIs(baselinker.external_storages.request, baselinker.request)
+        self.assertIs(baselinker.product_catalog.request, baselinker.request)
+
+    def test_init_with_injected_request(self):
+        baselinker = Baselinker(api_token='my_token', request=self.request_mock)
+        self.assertIs(baselinker.request, self.request_mock)
+        self.assertIs(baselinker.orders.request, self.request_mock)
+
+    def test_init_creates_shared_rate_limiter(self):
+        baselinker = Baselinker(api_token='my_token', requests_per_minute=50, burst=5)
+        self.assertEqual(baselinker.request.rate_limiter.rate, 50)
+        self.assertEqual(baselinker.request.rate_limiter.burst, 5)
+
+    def test_init_without_rate_limiter(self):
+        baselinker = Baselinker(api_token='my_token', requests_per_minute=None)
+        self.assertIsNone(baselinker.request.rate_limiter)
+
+    def test_map_resolves_method_by_name(self):
+        baselinker = Baselinker(api_token='my_token', request=self.request_mock)
+        self.request_mock.make_request.side_effect = lambda method_name, **kwargs: kwargs['order_id']
+
+        results = list(baselinker.map('get_order_payments_history', [{'order_id': 1}, {'order_id': 2}]))
+
+        self.assertEqual([result.result for result in results], [1, 2])
+        self.request_mock.make_request.assert_any_call('getOrderPaymentsHistory', order_id=1,
+                                                       show_full_history=None)
+
+    def test_map_resolves_qualified_method_name(self):
+        baselinker = Baselinker(api_token='my_token', request=self.request_mock)
+        self.request_mock.make_request.return_value = {'status': 'SUCCESS'}
+
+        results = list(baselinker.map('orders.set_order_status', [{'order_id': 1, 'status_id': 2}]))
+
+        self.assertTrue(results[0].ok)
+        self.request_mock.make_request.assert_called_with('setOrderStatus', order_id=1, status_id=2)
+
+    def test_map_with_unknown_method(self):
+        baselinker = Baselinker(api_token='my_token', request=self.request_mock)
+        with self.assertRaises(AttributeError):
+            baselinker.map('unknown_method', [])
@@ -0,0 +1,149 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from baselinker import run_batch
+from baselinker.batch import chunked, run_chunked
+
+
+class TestRunBatch(unittest.TestCase):
+
+    def test_results_are_yielded_in_input_order(self):
+        def call(value):
+            time.sleep(0.01 * (5 - value))
+            return value * 2
+
+        results = list(run_batch(call, ({'value': value} for value in range(5)), max_workers=5))
+
+        self.assertEqual([result.result for result in results], [0, 2, 4, 6, 8])
+        self.assertEqual([result.index for result in results], [0, 1, 2, 3, 4])
+
+    def test_results_are_yielded_as_completed(self):
+        def call(value):
+            time.sleep(0.05 if value == 0 else 0)
+            return value
+
+        results = list(run_batch(call, [{'value': value} for value in range(3)], max_workers=3, ordered=False))
+
+        self.assertEqual(results[-1].result, 0)
+        self.assertEqual(sorted(result.index for result in results), [0, 1, 2])
+
+    def test_errors_are_collected_per_item(self):
+        def call(value):
+            if value == 1:
+                raise ValueError('bad value')
+            return value
+
+        results = list(run_batch(call, [{'value': value} for value in range(3)]))
+
+        self.assertEqual([result.ok for result in results], [True, False, True])
+        self.assertIsInstance(results[1].error, ValueError)
+        self.assertEqual(results[1].kwargs, {'value': 1})
+
+    def test_concurrency_is_bounded(self):
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def call(value):
+            with lock:
+                running.append(value)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(value)
+
+        list(run_batch(call, [{'value': value} for value in range(20)], max_workers=3))
+
+        self.assertLessEqual(max(peak), 3)
+
+    def test_invalid_max_workers(self):
+        with self.assertRaises(ValueError):
+            list(run_batch(lambda: None, [{}], max_workers=0))
+
+    def test_failure_reports_exceptions_and_error_responses(self):
+        responses = {1: {'status': 'SUCCESS'}, 2: {'status': 'ERROR', 'error_code': 'ERROR_X'}}
+
+        def call(value):
+            if value == 3:
+                raise ValueError('bad value')
+            return responses[value]
+
+        results = list(run_batch(call, [{'value': value} for value in (1, 2, 3)]))
+
+        self.assertIsNone(results[0].failure)
+        self.assertEqual(results[1].failure, responses[2])
+        self.assertIsInstance(results[2].failure, ValueError)
+        self.assertEqual([result.ok for result in results], [True, False, False])
+
+    def test_chunked(self):
+        self.assertEqual(list(chunked(iter(range(5)), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(chunked([], 2)), [])
+        with self.assertRaises(ValueError):
+            list(chunked([1], 0))
+
+
+class TestRunChunked(unittest.TestCase):
+
+    def test_run_chunked_sends_a_different_update_with_the_same_checkpoint(self):
+        sent = []
+
+        def update(products):
+            sent.append(products)
+            if products == {2: 3}:
+                return {'status': 'ERROR', 'error_code': 'ERROR_X'}
+            return {'status': 'SUCCESS', 'counter': len(products)}
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'stock.json')
+            run_chunked(update, lambda chunk: {'products': dict(chunk)}, chunked({1: 5, 2: 3}.items(), 1),
+                        checkpoint_path=path, checkpoint_key='feed')
+            self.assertTrue(os.path.exists(path))
+
+            sent.clear()
+            report = run_chunked(update, lambda chunk: {'products': dict(chunk)}, chunked({1: 4, 2: 2}.items(), 1),
+                                 checkpoint_path=path, checkpoint_key='feed')
+            self.assertEqual(sent, [{1: 4}, {2: 2}])
+            self.assertEqual((report['counter'], report['errors']), (2, {}))
+            self.assertFalse(os.path.exists(path))
+
+    def test_run_chunked_merges_counters_and_warnings(self):
+        def update(products):
+            return {'status': 'SUCCESS', 'counter': len(products),
+                    'warnings': {str(product_id): 'Unknown product' for product_id in products if product_id % 5 == 0}}
+
+        report = run_chunked(update, lambda chunk: {'products': chunk}, chunked(range(1, 13), 4), max_workers=2)
+        self.assertEqual(report['counter'], 12)
+        self.assertEqual(sorted(report['warnings']), ['10', '5'])
+        self.assertEqual((report['chunks'], report['errors']), (3, {}))
+
+    def test_run_chunked_resumes_from_checkpoint(self):
+        sent = []
+
+        failing = {5}
+
+        def update(products):
+            sent.append(products)
+            if products[0] in failing:
+                return {'status': 'ERROR', 'error_code': 'ERROR_X'}
+            return {'status': 'SUCCESS', 'counter': len(products), 'warnings': []}
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'stock.json')
+            report = run_chunked(update, lambda chunk: {'products': chunk}, chunked(range(1, 13), 4),
+                                 checkpoint_path=path, checkpoint_key='feed')
+            self.assertEqual(list(report['errors']), [1])
+            self.assertEqual(report['counter'], 8)
+            with self.assertRaises(ValueError):
+                run_chunked(update, lambda chunk: {'products': chunk}, [], checkpoint_path=path,
+                            checkpoint_key='other')
+
+            sent.clear()
+            failing.clear()
+            report = run_chunked(update, lambda chunk: {'products': chunk}, chunked(range(1, 13), 4),
+                                 checkpoint_path=path, checkpoint_key='feed')
+            self.assertEqual(sent, [[5, 6, 7, 8]])
+            self.assertEqual(report['counter'], 12)
+            self.assertEqual(report['errors'], {})
+            self.assertFalse(os.path.exists(path))
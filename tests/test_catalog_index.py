@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from baselinker.catalog_index import CatalogIndex
+
+
+class TestCatalogIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog_products = [{'id': 1, 'sku': 'MUG', 'ean': '590001'}, {'id': 2, 'sku': 'CUP', 'ean': ''}]
+        self.product_catalog = MagicMock()
+        self.product_catalog.iter_inventory_products.side_effect = self.iter_inventory_products
+        self.product_catalog.iter_inventory_products_data.side_effect = lambda inventory_id, products, **kwargs: iter(
+            [('1', {'variants': {'11': {'sku': 'MUG-RED', 'ean': '590011'}}})] if 1 in products else [])
+        self.index = CatalogIndex(self.product_catalog, 7)
+
+    def iter_inventory_products(self, inventory_id, pages_in_flight=2, filter_sort=None):
+        products = list(self.catalog_products)
+        if filter_sort == 'id DESC':
+            products.reverse()
+        return iter(products)
+
+    def test_rebuild_indexes_sku_and_ean(self):
+        self.assertEqual(self.index.rebuild(), 2)
+        self.assertEqual(self.index.get_by_sku('CUP'), 2)
+        self.assertEqual(self.index.get_by_ean('590001'), 1)
+        self.assertIsNone(self.index.get_by_ean(''))
+        self.assertIsNone(self.index.get_by_sku('MISSING'))
+
+    def test_rebuild_with_variants(self):
+        index = CatalogIndex(self.product_catalog, 7, with_variants=True)
+        index.rebuild()
+        self.assertEqual(index.get_by_sku('MUG-RED'), 11)
+        self.assertEqual(index.get_parent(11), 1)
+        self.assertEqual(index.get_variants(1), [11])
+        index.discard(1)
+        self.assertIsNone(index.get_by_sku('MUG-RED'))
+        self.assertIsNone(index.get_by_ean('590001'))
+
+    def test_refresh_adds_only_new_products(self):
+        self.index.rebuild()
+        self.catalog_products.append({'id': 3, 'sku': 'PLATE', 'ean': '590003'})
+        self.assertEqual(self.index.refresh(), 1)
+        self.assertEqual(self.index.get_by_sku('PLATE'), 3)
+        self.assertEqual(len(self.index), 3)
+
+    def test_save_and_load(self):
+        index = CatalogIndex(self.product_catalog, 7, with_variants=True)
+        index.rebuild()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'index.json')
+            self.assertFalse(self.index.load(path))
+            index.save(path)
+            self.assertTrue(self.index.load(path))
+            self.assertEqual(self.index.get_by_sku('MUG-RED'), 11)
+            self.assertEqual(self.index.get_variants(1), [11])
+            with self.assertRaises(ValueError):
+                CatalogIndex(self.product_catalog, 8).load(path)
+
+    def test_lookups_keep_working_during_rebuild(self):
+        self.index.rebuild()
+        lookups = []
+
+        def iter_inventory_products(inventory_id, pages_in_flight=2, filter_sort=None):
+            for product in self.catalog_products:
+                lookups.append(self.index.get_by_sku('MUG'))
+                yield product
+
+        self.product_catalog.iter_inventory_products.side_effect = iter_inventory_products
+        self.catalog_products = [{'id': 1, 'sku': 'MUG-NEW', 'ean': '590001'}]
+        self.index.rebuild()
+        self.assertEqual(lookups, [1])
+        self.assertIsNone(self.index.get_by_sku('MUG'))
+        self.assertEqual(self.index.get_by_sku('MUG-NEW'), 1)
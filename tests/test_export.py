@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+import unittest
+from unittest.mock import MagicMock
+from baselinker.export import export_invoices
+
+
+class TestExportInvoices(unittest.TestCase):
+
+    def setUp(self):
+        self.orders = MagicMock()
+        self.orders.iter_invoices.return_value = iter([
+            {'invoice_id': 1, 'order_id': 10, 'number': 'FV 1', 'items': [{'name': 'A'}]},
+            {'invoice_id': 2, 'order_id': 20, 'number': 'FV 2', 'items': []},
+        ])
+
+    def test_export_ndjson(self):
+        file = io.StringIO()
+        self.assertEqual(export_invoices(self.orders, file, series_id=5), 2)
+        self.orders.iter_invoices.assert_called_once_with(series_id=5)
+        lines = [json.loads(line) for line in file.getvalue().splitlines()]
+        self.assertEqual([line['invoice_id'] for line in lines], [1, 2])
+        self.assertEqual(lines[0]['items'], [{'name': 'A'}])
+
+    def test_export_csv_skips_nested_fields_by_default(self):
+        file = io.StringIO(newline='')
+        export_invoices(self.orders, file, format='csv')
+        rows = list(csv.DictReader(io.StringIO(file.getvalue())))
+        self.assertEqual(list(rows[0]), ['invoice_id', 'order_id', 'number'])
+        self.assertEqual(rows[1]['number'], 'FV 2')
+
+    def test_export_csv_writes_selected_nested_fields_as_json(self):
+        file = io.StringIO(newline='')
+        export_invoices(self.orders, file, format='csv', fields=['invoice_id', 'items'])
+        rows = list(csv.DictReader(io.StringIO(file.getvalue())))
+        self.assertEqual(json.loads(rows[0]['items']), [{'name': 'A'}])
+
+    def test_export_with_receipts(self):
+        def get_receipt(order_id):
+            if order_id == 10:
+                return {'status': 'SUCCESS', 'receipt_id': 7, 'receipt_full_nr': 'PAR 7'}
+            return {'status': 'ERROR', 'error_code': 'ERROR_RECEIPT_NOT_FOUND'}
+
+        self.orders.get_receipt.side_effect = get_receipt
+        file = io.StringIO()
+        export_invoices(self.orders, file, with_receipts=True)
+        lines = [json.loads(line) for line in file.getvalue().splitlines()]
+        self.assertEqual(lines[0]['receipt'], {'receipt_id': 7, 'receipt_full_nr': 'PAR 7'})
+        self.assertIsNone(lines[1]['receipt'])
+
+    def test_export_rejects_unknown_format(self):
+        with self.assertRaises(ValueError):
+            export_invoices(self.orders, io.StringIO(), format='xml')
@@ -77,3 +77,20 @@ class TestExternalStorages(unittest.TestCase):
         )
         self.mock_request.make_request.assert_called_with('updateExternalStorageProductsQuantity', **expected_params)
         self.assertTrue(result['success'])
+
+
+class TestBulkUpdateExternalStorageProductsQuantity(unittest.TestCase):
+
+    def test_bulk_update_merges_chunk_reports(self):
+        request = MagicMock()
+        request.make_request.side_effect = [
+            {'status': 'SUCCESS', 'counter': 2, 'warnings': {'2': 'Unknown product'}},
+            {'status': 'SUCCESS', 'counter': 1, 'warnings': {}},
+        ]
+        external_storages = ExternalStorages('my_token', request=request)
+        products = ((product_id, 0, 5) for product_id in range(1, 4))
+        report = external_storages.bulk_update_external_storage_products_quantity('shop_1', products, chunk_size=2,
+                                                                                  max_workers=1)
+        self.assertEqual(report, {'counter': 3, 'warnings': {'2': 'Unknown product'}, 'chunks': 2, 'errors': {}})
+        request.make_request.assert_called_with('updateExternalStorageProductsQuantity', storage_id='shop_1',
+                                                products=[[3, 0, 5]])
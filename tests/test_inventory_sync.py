@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from baselinker.inventory_sync import InventorySync, diff_values
+from baselinker.product_catalog import ProductCatalog
+
+
+class FakeCatalogApi:
+    """Serves stock and prices pages and records update calls"""
+
+    def __init__(self):
+        self.updates = []
+
+    def make_request(self, method_name, inventory_id, page=None, products=None):
+        if method_name == 'getInventoryProductsStock':
+            records = {'1': {'product_id': 1, 'stock': {'bl_1': 5}, 'variants': {'11': {'bl_1': 2}}}}
+            return {'status': 'SUCCESS', 'products': records if page == 1 else []}
+        if method_name == 'getInventoryProductsPrices':
+            records = {'1': {'product_id': 1, 'prices': {'105': 20.99}, 'variants': {}}}
+            return {'status': 'SUCCESS', 'products': records if page == 1 else []}
+        self.updates.append((method_name, products))
+        warnings = {'3': 'Unknown product'} if '3' in map(str, products) else {}
+        return {'status': 'SUCCESS', 'counter': len(products) - len(warnings), 'warnings': warnings}
+
+
+class TestDiffValues(unittest.TestCase):
+
+    def test_diff_values_returns_changed_entries_only(self):
+        known = {'1': {'bl_1': 5, 'bl_2': 1}, '2': {'bl_1': 0}}
+        desired = {1: {'bl_1': 5.0, 'bl_2': 2}, 2: {'bl_1': 0}, 3: {'bl_1': 7}}
+        self.assertEqual(diff_values(known, desired), {1: {'bl_2': 2}, 3: {'bl_1': 7}})
+
+
+class TestInventorySync(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeCatalogApi()
+        self.product_catalog = ProductCatalog('my_token', request=self.api)
+
+    def test_refresh_reads_stock_and_prices_including_variants(self):
+        sync = InventorySync(self.product_catalog, 1)
+        sync.refresh()
+        self.assertEqual(sync.stock, {'1': {'bl_1': 5}, '11': {'bl_1': 2}})
+        self.assertEqual(sync.prices, {'1': {'105': 20.99}})
+
+    def test_push_stock_sends_only_changes(self):
+        sync = InventorySync(self.product_catalog, 1)
+        sync.refresh()
+        report = sync.push_stock({1: {'bl_1': 5}, 11: {'bl_1': 3}})
+        self.assertEqual(self.api.updates, [('updateInventoryProductsStock', {11: {'bl_1': 3}})])
+        self.assertEqual(report['changed'], 1)
+        self.assertEqual(sync.stock['11'], {'bl_1': 3})
+
+        self.api.updates.clear()
+        sync.push_stock({1: {'bl_1': 5}, 11: {'bl_1': 3}})
+        self.assertEqual(self.api.updates, [])
+
+    def test_push_prices_keeps_entries_with_warnings_pending(self):
+        sync = InventorySync(self.product_catalog, 1)
+        sync.push_prices({1: {105: 19.99}, 3: {105: 5}})
+        self.assertEqual(sync.prices, {'1': {'105': 19.99}})
+        self.api.updates.clear()
+        sync.push_prices({1: {105: 19.99}, 3: {105: 5}})
+        self.assertEqual(self.api.updates, [('updateInventoryProductsPrices', {3: {105: 5}})])
+
+    def test_snapshot_is_restored_from_disk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'snapshot.json')
+            InventorySync(self.product_catalog, 1, snapshot_path=path).push_stock({1: {'bl_1': 4}})
+            sync = InventorySync(self.product_catalog, 1, snapshot_path=path)
+            self.assertEqual(sync.stock, {'1': {'bl_1': 4}})
+            with self.assertRaises(ValueError):
+                InventorySync(self.product_catalog, 2, snapshot_path=path)
+
+    def test_failed_chunks_are_not_remembered(self):
+        request = MagicMock()
+        request.make_request.return_value = {'status': 'ERROR', 'error_code': 'ERROR_X'}
+        sync = InventorySync(ProductCatalog('my_token', request=request), 1)
+        report = sync.push_stock({1: {'bl_1': 4}})
+        self.assertEqual(list(report['errors']), [0])
+        self.assertEqual(sync.stock, {})
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from baselinker import BaselinkerError, JournalFollower
+
+
+class TestJournalFollower(unittest.TestCase):
+
+    def setUp(self):
+        self.orders = MagicMock()
+        self.logs = [
+            {'log_id': 11, 'log_type': 18, 'order_id': 1, 'object_id': 0, 'date': 1},
+            {'log_id': 12, 'log_type': 3, 'order_id': 2, 'object_id': 0, 'date': 2},
+            {'log_id': 13, 'log_type': 16, 'order_id': 1, 'object_id': 0, 'date': 3},
+            {'log_id': 14, 'log_type': 4, 'order_id': 3, 'object_id': 0, 'date': 4},
+        ]
+        self.orders.get_journal_list.side_effect = self.get_journal_list
+        self.orders.get_orders.side_effect = lambda order_id, **kwargs: {
+            'status': 'SUCCESS', 'orders': [] if order_id == 3 else [{'order_id': order_id}]}
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.directory.name, 'journal.json')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def get_journal_list(self, last_log_id, logs_types, order_id):
+        return {'status': 'SUCCESS', 'logs': [log for log in self.logs if log['log_id'] > last_log_id]}
+
+    def test_fetch_changes_groups_events_by_order(self):
+        follower = JournalFollower(self.orders, last_log_id=10)
+
+        changes, last_log_id = follower.fetch_changes()
+
+        self.assertEqual(last_log_id, 14)
+        self.assertEqual([change.order_id for change in changes], [1, 2, 3])
+        self.assertEqual([log['log_id'] for log in changes[0].events], [11, 13])
+        self.assertEqual(changes[0].order, {'order_id': 1})
+        self.assertTrue(changes[2].deleted)
+        self.assertEqual(self.orders.get_orders.call_count, 3)
+        self.assertEqual(follower.last_log_id, 10)
+
+    def test_sync_once_persists_checkpoint(self):
+        handler = MagicMock()
+        follower = JournalFollower(self.orders, checkpoint_path=self.checkpoint_path, last_log_id=12)
+
+        self.assertEqual(follower.sync_once(handler), 2)
+
+        handler.assert_called_once()
+        self.assertEqual(JournalFollower(self.orders, checkpoint_path=self.checkpoint_path).last_log_id, 14)
+        self.assertEqual(follower.sync_once(handler), 0)
+        handler.assert_called_once()
+
+    def test_sync_once_does_not_commit_when_handler_fails(self):
+        follower = JournalFollower(self.orders, checkpoint_path=self.checkpoint_path)
+
+        with self.assertRaises(RuntimeError):
+            follower.sync_once(MagicMock(side_effect=RuntimeError))
+
+        self.assertEqual(follower.last_log_id, 0)
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    def test_fetch_changes_pages_through_journal(self):
+        self.logs = [{'log_id': log_id, 'log_type': 18, 'order_id': log_id % 5, 'object_id': 0, 'date': 0}
+                     for log_id in range(1, 151)]
+        self.orders.get_journal_list.side_effect = lambda last_log_id, logs_types, order_id: {
+            'status': 'SUCCESS', 'logs': [log for log in self.logs if log['log_id'] > last_log_id][:100]}
+
+        changes, last_log_id = JournalFollower(self.orders).fetch_changes()
+
+        self.assertEqual(last_log_id, 150)
+        self.assertEqual(len(changes), 5)
+        self.assertEqual(self.orders.get_journal_list.call_count, 2)
+
+    def test_fetch_changes_raises_api_error(self):
+        self.orders.get_journal_list.side_effect = None
+        self.orders.get_journal_list.return_value = {'status': 'ERROR', 'error_code': 'ERROR_X'}
+        with self.assertRaises(BaselinkerError):
+            JournalFollower(self.orders).fetch_changes()
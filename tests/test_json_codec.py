@@ -0,0 +1,39 @@
+import unittest
+from baselinker.json_codec import CODECS, StdlibCodec, get_codec, orjson, ujson
+
+
+class TestJsonCodec(unittest.TestCase):
+
+    def setUp(self):
+        self.codecs = [codec() for name, codec in CODECS.items()
+                       if not (name == 'orjson' and orjson is None) and not (name == 'ujson' and ujson is None)]
+
+    def test_get_codec_picks_fastest_installed(self):
+        expected = 'orjson' if orjson is not None else 'ujson' if ujson is not None else 'json'
+        self.assertEqual(get_codec().name, expected)
+
+    def test_get_codec_by_name(self):
+        self.assertIsInstance(get_codec('json'), StdlibCodec)
+
+    def test_get_codec_with_unknown_name(self):
+        with self.assertRaises(ValueError):
+            get_codec('unknown')
+
+    def test_codecs_produce_identical_compact_output(self):
+        parameters = {'inventory_id': 307, 'products': {'2685': {'bl_206': 5}}, 'url': 'https://a/b'}
+        for codec in self.codecs:
+            self.assertEqual(codec.dumps(parameters),
+                             '{"inventory_id":307,"products":{"2685":{"bl_206":5}},"url":"https://a/b"}')
+
+    def test_codecs_keep_non_ascii_characters(self):
+        for codec in self.codecs:
+            self.assertEqual(codec.dumps({'city': 'Łódź'}), '{"city":"Łódź"}')
+
+    def test_codecs_encode_integer_keys(self):
+        for codec in self.codecs:
+            self.assertEqual(codec.dumps({'products': {2685: 5}}), '{"products":{"2685":5}}')
+
+    def test_codecs_decode_bytes(self):
+        content = '{"status": "SUCCESS", "name": "Żółw"}'.encode('utf-8')
+        for codec in self.codecs:
+            self.assertEqual(codec.loads(content), {'status': 'SUCCESS', 'name': 'Żółw'})
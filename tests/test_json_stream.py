@@ -0,0 +1,51 @@
+import json
+import unittest
+from baselinker.json_stream import iter_member
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestIterMember(unittest.TestCase):
+
+    def setUp(self):
+        self.response = {
+            'status': 'SUCCESS',
+            'skipped': [1, {'text': 'brackets ]} and "quotes" \\'}],
+            'products': {
+                '2685': {'name': 'Żółw "zielony" {[', 'price': 12.5, 'variants': [1, 2, {'id': None}]},
+                '2686': {},
+                '2687': 7,
+            },
+            'after': True,
+        }
+        self.content = json.dumps(self.response, ensure_ascii=False).encode('utf-8')
+
+    def test_yields_object_members_for_any_chunk_size(self):
+        for size in (1, 2, 7, 64, len(self.content)):
+            records = list(iter_member(chunked(self.content, size), 'products'))
+            self.assertEqual(records, list(self.response['products'].items()))
+
+    def test_yields_array_members(self):
+        content = json.dumps({'status': 'SUCCESS', 'orders': [{'order_id': 1}, {'order_id': 2}, 123]}).encode()
+        for size in (1, 5):
+            self.assertEqual(list(iter_member(chunked(content, size), 'orders')),
+                             [{'order_id': 1}, {'order_id': 2}, 123])
+
+    def test_empty_member(self):
+        self.assertEqual(list(iter_member([b'{"status": "SUCCESS", "orders": []}'], 'orders')), [])
+        self.assertEqual(list(iter_member([b'{"products": {}}'], 'products')), [])
+
+    def test_uses_given_loads(self):
+        records = list(iter_member([b'{"orders": [{"order_id": 1}]}'], 'orders', loads=bytes))
+        self.assertEqual(records, [b'{"order_id": 1}'])
+
+    def test_missing_member_reports_error(self):
+        content = b'{"status": "ERROR", "error_code": "ERROR_BLOCKED_TOKEN", "error_message": "Blocked"}'
+        with self.assertRaisesRegex(ValueError, 'ERROR_BLOCKED_TOKEN'):
+            list(iter_member([content], 'orders'))
+
+    def test_truncated_stream(self):
+        with self.assertRaisesRegex(ValueError, 'Unexpected end'):
+            list(iter_member(chunked(self.content[:-40], 16), 'products'))
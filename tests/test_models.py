@@ -0,0 +1,98 @@
+import json
+import pickle
+import unittest
+from unittest.mock import MagicMock
+from baselinker import Baselinker
+from baselinker.models import Invoice, InventoryProduct, Order, OrderProduct, as_dict, convert_response
+from baselinker.orders import Orders
+from baselinker.product_catalog import ProductCatalog
+
+
+ORDER = {'order_id': 1, 'currency': 'PLN', 'email': 'jan@example.com', 'custom_field': 'x',
+         'products': [{'name': 'Mug', 'sku': 'MUG-1', 'quantity': 2}]}
+
+
+class TestModel(unittest.TestCase):
+
+    def test_model_behaves_like_the_response_dict(self):
+        order = Order.from_dict(dict(ORDER))
+        self.assertEqual(order['order_id'], 1)
+        self.assertEqual(order.email, 'jan@example.com')
+        self.assertEqual(order['custom_field'], 'x')
+        self.assertIsNone(order.get('phone'))
+        self.assertNotIn('phone', order)
+        self.assertEqual(dict(order)['currency'], 'PLN')
+        self.assertEqual(len(order), 5)
+        with self.assertRaises(KeyError):
+            order['phone']
+
+    def test_pick_and_pack_status_are_known_fields(self):
+        order = Order.from_dict({'order_id': 1, 'pick_status': '1', 'pack_status': '0'})
+        self.assertIsNone(order.extra)
+        self.assertEqual((order.pick_status, order['pack_status']), ('1', '0'))
+
+    def test_model_is_read_only(self):
+        with self.assertRaises(AttributeError):
+            Order.from_dict(dict(ORDER)).email = 'other@example.com'
+
+    def test_nested_products_are_parsed_on_first_access(self):
+        order = Order.from_dict(dict(ORDER))
+        products = order.products
+        self.assertIsInstance(products[0], OrderProduct)
+        self.assertEqual(products[0].sku, 'MUG-1')
+        self.assertIs(order['products'], products)
+
+    def test_repeated_strings_are_interned(self):
+        first = Order.from_dict(json.loads(json.dumps(ORDER)))
+        second = Order.from_dict(json.loads(json.dumps(ORDER)))
+        self.assertIs(first.currency, second.currency)
+
+    def test_to_dict_round_trip(self):
+        order = Order.from_dict(dict(ORDER))
+        order.products
+        self.assertEqual(order.to_dict(), ORDER)
+        self.assertEqual(as_dict(order), ORDER)
+        self.assertEqual(pickle.loads(pickle.dumps(order)).to_dict(), ORDER)
+
+    def test_invoice_items_do_not_shadow_mapping_methods(self):
+        invoice = Invoice.from_dict({'invoice_id': 5, 'items': [{'name': 'Mug'}]})
+        self.assertEqual(invoice['items'], [{'name': 'Mug'}])
+        self.assertEqual(dict(invoice.items()), {'invoice_id': 5, 'items': [{'name': 'Mug'}]})
+
+
+class TestConvertResponse(unittest.TestCase):
+
+    def test_convert_list_member(self):
+        response = convert_response({'status': 'SUCCESS', 'orders': [dict(ORDER)]}, 'orders', Order)
+        self.assertIsInstance(response['orders'][0], Order)
+
+    def test_convert_member_keyed_by_id(self):
+        response = convert_response({'status': 'SUCCESS', 'products': {'7': {'sku': 'A'}}}, 'products',
+                                    InventoryProduct)
+        self.assertEqual(response['products']['7'].product_id, 7)
+
+    def test_error_response_is_left_untouched(self):
+        response = {'status': 'ERROR', 'error_code': 'ERROR_X'}
+        self.assertEqual(convert_response(dict(response), 'orders', Order), response)
+
+
+class TestClientModels(unittest.TestCase):
+
+    def test_orders_return_models_when_enabled(self):
+        request = MagicMock()
+        request.make_request.return_value = {'status': 'SUCCESS', 'orders': [dict(ORDER)]}
+        self.assertIsInstance(Orders('my_token', request=request, models=True).get_orders()['orders'][0], Order)
+        request.make_request.return_value = {'status': 'SUCCESS', 'orders': [dict(ORDER)]}
+        self.assertIsInstance(Orders('my_token', request=request).get_orders()['orders'][0], dict)
+
+    def test_product_catalog_returns_models_when_enabled(self):
+        request = MagicMock()
+        request.stream_request.return_value = iter([('7', {'sku': 'A'})])
+        catalog = ProductCatalog('my_token', request=request, models=True)
+        [(product_id, product)] = list(catalog.stream_inventory_products_data(1, [7]))
+        self.assertEqual((product_id, product.sku), ('7', 'A'))
+
+    def test_client_flag_is_passed_to_sub_clients(self):
+        client = Baselinker('my_token', request=MagicMock(), models=True)
+        self.assertTrue(client.orders.models)
+        self.assertTrue(client.product_catalog.models)
@@ -0,0 +1,76 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from baselinker import OrderMirror, OrderChange
+
+
+class TestOrderMirror(unittest.TestCase):
+
+    def setUp(self):
+        self.orders_data = [
+            {'order_id': 1, 'email': 'John@Example.com', 'phone': '+48 693-123-123', 'order_status_id': 10,
+             'date_confirmed': 100, 'external_order_id': 'A-1'},
+            {'order_id': 2, 'email': 'jane@example.com', 'phone': '', 'order_status_id': 20,
+             'date_confirmed': 200, 'external_order_id': ''},
+            {'order_id': 3, 'email': 'john@example.com', 'phone': '48693123123', 'order_status_id': 10,
+             'date_confirmed': 300, 'external_order_id': 'A-3'},
+        ]
+        self.orders = MagicMock()
+        self.orders.iter_orders.return_value = iter(self.orders_data)
+        self.mirror = OrderMirror(self.orders, max_age=60)
+
+    def tearDown(self):
+        self.mirror.close()
+
+    def test_sync_downloads_orders_since_newest(self):
+        self.assertEqual(self.mirror.sync(batch_size=2), 3)
+        self.orders.iter_orders.assert_called_with(date_confirmed_from=0)
+
+        self.orders.iter_orders.return_value = iter([])
+        self.mirror.sync()
+        self.orders.iter_orders.assert_called_with(date_confirmed_from=300)
+
+    def test_lookups_are_served_locally_when_fresh(self):
+        self.mirror.sync()
+
+        by_email = self.mirror.get_orders_by_email('JOHN@example.com ')
+        by_phone = self.mirror.get_orders_by_phone('48 693 123 123')
+
+        self.assertEqual([order['order_id'] for order in by_email['orders']], [1, 3])
+        self.assertEqual([order['order_id'] for order in by_phone['orders']], [1, 3])
+        self.orders.get_orders_by_email.assert_not_called()
+        self.orders.get_orders_by_phone.assert_not_called()
+
+    def test_lookups_fall_back_to_api_when_stale(self):
+        self.mirror.sync()
+        with patch('baselinker.order_mirror.time.time', return_value=self.mirror.last_synced_at + 61):
+            self.mirror.get_orders_by_email('john@example.com')
+            self.mirror.get_orders_by_phone('693123123')
+        self.orders.get_orders_by_email.assert_called_once_with('john@example.com')
+        self.orders.get_orders_by_phone.assert_called_once_with('693123123')
+
+    def test_lookups_fall_back_to_api_before_first_sync(self):
+        self.mirror.get_orders_by_email('john@example.com')
+        self.orders.get_orders_by_email.assert_called_once_with('john@example.com')
+
+    def test_indexed_lookups(self):
+        self.mirror.upsert_orders(self.orders_data)
+        self.assertEqual(self.mirror.get_order(2)['email'], 'jane@example.com')
+        self.assertIsNone(self.mirror.get_order(99))
+        self.assertEqual([order['order_id'] for order in self.mirror.get_orders_by_status(10)], [1, 3])
+        self.assertEqual([order['order_id'] for order in self.mirror.get_orders_by_external_order_id('A-3')], [3])
+        self.assertEqual([order['order_id'] for order in self.mirror.get_orders_confirmed_between(100, 300)], [1, 2])
+
+    def test_apply_changes_updates_and_deletes_orders(self):
+        self.mirror.upsert_orders(self.orders_data)
+        changed = dict(self.orders_data[0], order_status_id=30)
+
+        self.mirror.apply_changes([OrderChange(1, [], changed), OrderChange(2, [], None)])
+
+        self.assertEqual(self.mirror.get_order(1)['order_status_id'], 30)
+        self.assertIsNone(self.mirror.get_order(2))
+        self.assertTrue(self.mirror.is_fresh)
+
+    def test_get_order_statuses(self):
+        self.mirror.upsert_orders(self.orders_data)
+        self.assertEqual(self.mirror.get_order_statuses(), {1: 10, 2: 20, 3: 10})
+        self.assertEqual(self.mirror.get_order_statuses([2, '3', 99]), {2: 20, 3: 10})
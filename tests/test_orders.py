@@ -1,5 +1,9 @@
+import io
+import pathlib
+import tempfile
 import unittest
 from unittest.mock import MagicMock
+from baselinker import NULL, BaselinkerError
 from baselinker.orders import Orders
 
 
@@ -125,6 +129,42 @@ class TestOrders(unittest.TestCase):
                                                             pack_state=None)
         self.assertTrue(result["success"])
 
+    def test_update_order_if_changed_sends_only_changed_fields(self):
+        order = {'order_id': 123, 'delivery_city': 'London', 'delivery_price': '10.00', 'want_invoice': '0',
+                 'pick_status': '1', 'admin_comments': ''}
+
+        self.orders.update_order_if_changed(order, delivery_city='London', delivery_price=10, want_invoice=True,
+                                            pick_state=1, admin_comments=None, delivery_postcode='E2 8HQ')
+
+        self.orders.request.make_request.assert_called_once()
+        args, kwargs = self.orders.request.make_request.call_args
+        self.assertEqual(args, ('setOrderFields',))
+        self.assertEqual({key: value for key, value in kwargs.items() if value is not None},
+                         {'order_id': 123, 'want_invoice': True, 'delivery_postcode': 'E2 8HQ'})
+
+    def test_update_order_if_changed_skips_unchanged_order(self):
+        order = {'order_id': 123, 'delivery_city': 'London', 'email': 'test@example.com'}
+
+        result = self.orders.update_order_if_changed(order, delivery_city='London', email='test@example.com')
+
+        self.assertIsNone(result)
+        self.orders.request.make_request.assert_not_called()
+
+    def test_update_order_if_changed_with_explicit_null(self):
+        order = {'order_id': 123, 'extra_field_1': 'value', 'extra_field_2': ''}
+        changed = self.orders.get_changed_order_fields(order, extra_field_1=NULL, extra_field_2=NULL)
+        self.assertEqual(changed, {'extra_field_1': NULL})
+
+    def test_update_orders_if_changed_reports_counts(self):
+        updates = [({'order_id': 1, 'delivery_city': 'London'}, {'delivery_city': 'London'}),
+                   ({'order_id': 2, 'delivery_city': 'London'}, {'delivery_city': 'Paris'}),
+                   ({'order_id': 3, 'delivery_city': 'Paris'}, {'delivery_city': 'Paris'})]
+
+        report = self.orders.update_orders_if_changed(updates)
+
+        self.assertEqual(report, {'sent': 1, 'skipped': 2, 'errors': {}})
+        self.orders.request.make_request.assert_called_once()
+
     def test_add_order_product(self):
         result = self.orders.add_order_product(order_id=123, storage="shop", storage_id="store123", product_id="ABC123",
                                                name="Product A", price_brutto=10.99, quantity=2)
@@ -164,6 +204,26 @@ class TestOrders(unittest.TestCase):
         self.orders.request.make_request.assert_called_with('setOrderStatus', order_id=123, status_id=2)
         self.assertTrue(result["success"])
 
+    def test_set_order_statuses_skips_orders_in_target_status(self):
+        self.orders.request.make_request.side_effect = lambda method_name, order_id, status_id: (
+            {'status': 'ERROR', 'error_code': 'ERROR_X'} if order_id == 3 else {'status': 'SUCCESS'})
+
+        report = self.orders.set_order_statuses({1: 5, 2: 5, 3: 6}, known_statuses={'1': '5', 2: 4})
+
+        self.assertEqual(report['skipped'], [1])
+        self.assertEqual(report['updated'], [2])
+        self.assertEqual(report['errors'], {3: {'status': 'ERROR', 'error_code': 'ERROR_X'}})
+        self.assertEqual(self.orders.request.make_request.call_count, 2)
+
+    def test_set_order_statuses_with_order_snapshot(self):
+        self.orders.request.make_request.side_effect = RuntimeError('connection lost')
+
+        report = self.orders.set_order_statuses({1: 5, 2: 5}, known_statuses=[{'order_id': 1, 'order_status_id': 5},
+                                                                             {'order_id': 2, 'order_status_id': 4}])
+
+        self.assertEqual(report['skipped'], [1])
+        self.assertIsInstance(report['errors'][2], RuntimeError)
+
     def test_set_order_receipt(self):
         result = self.orders.set_order_receipt(receipt_id=1, receipt_nr="R123", date=987654321, printer_error=False)
         self.orders.request.make_request.assert_called_with('setOrderReceipt', receipt_id=1, receipt_nr="R123",
@@ -177,3 +237,117 @@ class TestOrders(unittest.TestCase):
                                                             file="base64_encoded_file",
                                                             external_invoice_number="INV001")
         self.assertTrue(result["success"])
+
+    def test_add_order_invoice_file_streams_file_object(self):
+        self.orders.request.upload_request = MagicMock(return_value={"success": True})
+        file = io.BytesIO(b'%PDF-1.4')
+        result = self.orders.add_order_invoice_file(invoice_id=1, file=file, external_invoice_number="INV001")
+        self.orders.request.upload_request.assert_called_with('addOrderInvoiceFile', 'file', file, invoice_id=1,
+                                                              external_invoice_number="INV001")
+        self.assertTrue(result["success"])
+
+    def test_add_order_invoice_file_streams_path(self):
+        self.orders.request.upload_request = MagicMock(return_value={"success": True})
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory) / 'invoice.pdf'
+            path.write_bytes(b'%PDF-1.4')
+            self.orders.add_order_invoice_file(invoice_id=1, file=path, external_invoice_number="INV001")
+        args, kwargs = self.orders.request.upload_request.call_args
+        self.assertEqual(args[:2], ('addOrderInvoiceFile', 'file'))
+        self.assertTrue(args[2].closed)
+
+    def test_add_order_invoice_files_reports_results(self):
+        self.orders.request.upload_request = MagicMock(side_effect=lambda method_name, parameter, file, invoice_id,
+                                                       external_invoice_number: {'status': 'ERROR'}
+                                                       if invoice_id == 2 else {'status': 'SUCCESS'})
+        invoice_files = [{'invoice_id': invoice_id, 'file': io.BytesIO(b'%PDF'), 'external_invoice_number': 'F'}
+                         for invoice_id in (1, 2, 3)]
+        report = self.orders.add_order_invoice_files(invoice_files)
+        self.assertEqual(report, {'uploaded': [1, 3], 'errors': {2: {'status': 'ERROR'}}})
+
+    def test_init_with_shared_request(self):
+        request = MagicMock()
+        orders = Orders(self.api_token, request=request)
+        self.assertIs(orders.request, request)
+
+    def test_stream_orders(self):
+        self.orders.request.stream_request = MagicMock(return_value=iter([{"order_id": 1}]))
+        result = list(self.orders.stream_orders(date_confirmed_from=123456789))
+        self.orders.request.stream_request.assert_called_with('getOrders', 'orders', order_id=None,
+                                                              date_confirmed_from=123456789, date_from=None,
+                                                              id_from=None, get_unconfirmed_orders=None,
+                                                              status_id=None, filter_email=None)
+        self.assertEqual(result, [{"order_id": 1}])
+
+
+class FakeOrdersApi:
+    """Serves getOrders pages from a list of orders the way the API does, 100 at a time"""
+
+    def __init__(self, orders):
+        self.orders = sorted(orders, key=lambda order: (order['date_confirmed'], order['order_id']))
+        self.calls = []
+
+    def make_request(self, method_name, date_confirmed_from=None, id_from=None, **kwargs):
+        self.calls.append((date_confirmed_from, id_from))
+        if id_from is not None:
+            matching = sorted((order for order in self.orders if order['order_id'] >= id_from),
+                              key=lambda order: order['order_id'])
+        else:
+            matching = [order for order in self.orders if order['date_confirmed'] >= (date_confirmed_from or 0)]
+        return {'status': 'SUCCESS', 'orders': matching[:100]}
+
+
+class TestIterOrders(unittest.TestCase):
+
+    def setUp(self):
+        self.orders_data = [{'order_id': order_id, 'date_confirmed': 1000 + order_id // 7}
+                            for order_id in range(1, 451)]
+        self.api = FakeOrdersApi(self.orders_data)
+        self.orders = Orders('my_token', request=self.api)
+
+    def test_iter_orders_without_duplicates_or_gaps(self):
+        for prefetch in (True, False):
+            result = [order['order_id'] for order in self.orders.iter_orders(date_confirmed_from=1000,
+                                                                             prefetch=prefetch)]
+            self.assertEqual(sorted(result), list(range(1, 451)))
+            self.assertEqual(len(result), len(set(result)))
+
+    def test_iter_orders_stops_at_date_confirmed_to(self):
+        result = [order['order_id'] for order in self.orders.iter_orders(date_confirmed_from=1000,
+                                                                         date_confirmed_to=1020)]
+        self.assertEqual(result, list(range(1, 140)))
+
+    def test_iter_orders_advances_past_full_page_with_same_timestamp(self):
+        api = FakeOrdersApi([{'order_id': order_id, 'date_confirmed': 1000} for order_id in range(1, 151)]
+                            + [{'order_id': 151, 'date_confirmed': 1001}])
+        orders = Orders('my_token', request=api)
+        result = [order['order_id'] for order in orders.iter_orders(prefetch=False)]
+        self.assertEqual(result, list(range(1, 101)) + [151])
+
+    def test_iter_orders_by_id(self):
+        result = [order['order_id'] for order in self.orders.iter_orders(id_from=50)]
+        self.assertEqual(result, list(range(50, 451)))
+        self.assertEqual([call[1] for call in self.api.calls], [50, 150, 250, 350, 450])
+
+    def test_iter_orders_raises_api_error(self):
+        self.orders.request = MagicMock()
+        self.orders.request.make_request.return_value = {'status': 'ERROR', 'error_code': 'ERROR_X'}
+        with self.assertRaises(BaselinkerError):
+            list(self.orders.iter_orders())
+
+
+class TestIterInvoices(unittest.TestCase):
+
+    def test_iter_invoices_pages_by_invoice_id(self):
+        invoices = [{'invoice_id': invoice_id} for invoice_id in range(1, 251)]
+        calls = []
+
+        def make_request(method_name, id_from=None, **kwargs):
+            calls.append(id_from)
+            return {'status': 'SUCCESS', 'invoices': [invoice for invoice in invoices
+                                                      if invoice['invoice_id'] >= id_from][:100]}
+
+        orders = Orders('my_token', request=MagicMock(make_request=make_request))
+        result = [invoice['invoice_id'] for invoice in orders.iter_invoices(series_id=5)]
+        self.assertEqual(result, list(range(1, 251)))
+        self.assertEqual(calls, [0, 101, 201])
@@ -0,0 +1,81 @@
+import threading
+import unittest
+from baselinker.pagination import BaselinkerError, get_records, iter_numbered_pages, iter_pages
+
+
+class TestGetRecords(unittest.TestCase):
+
+    def test_get_records_returns_member(self):
+        self.assertEqual(get_records('getOrders', {'status': 'SUCCESS', 'orders': [1]}, 'orders'), [1])
+
+    def test_get_records_with_missing_member(self):
+        self.assertEqual(get_records('getOrders', {'status': 'SUCCESS'}, 'orders'), [])
+
+    def test_get_records_raises_for_error_response(self):
+        response = {'status': 'ERROR', 'error_code': 'ERROR_X', 'error_message': 'Failure'}
+        with self.assertRaises(BaselinkerError) as context:
+            get_records('getOrders', response, 'orders')
+        self.assertEqual(context.exception.error_code, 'ERROR_X')
+        self.assertIn('getOrders', str(context.exception))
+
+
+class TestIterPages(unittest.TestCase):
+
+    def test_iter_pages_walks_until_last_cursor(self):
+        pages = list(iter_pages(lambda cursor: [cursor] * 2, 1,
+                                lambda page, cursor: cursor + 1 if cursor < 3 else None))
+        self.assertEqual(pages, [(1, [1, 1]), (2, [2, 2]), (3, [3, 3])])
+
+    def test_iter_pages_prefetches_next_page(self):
+        second_page_requested = threading.Event()
+
+        def fetch_page(cursor):
+            if cursor == 2:
+                second_page_requested.set()
+            return [cursor]
+
+        pages = iter_pages(fetch_page, 1, lambda page, cursor: cursor + 1 if cursor < 2 else None)
+        self.assertEqual(next(pages), (1, [1]))
+        self.assertTrue(second_page_requested.wait(timeout=5))
+        self.assertEqual(list(pages), [(2, [2])])
+
+    def test_iter_pages_without_prefetch_fetches_lazily(self):
+        fetched = []
+
+        def fetch_page(cursor):
+            fetched.append(cursor)
+            return [cursor]
+
+        pages = iter_pages(fetch_page, 1, lambda page, cursor: cursor + 1, prefetch=False)
+        next(pages)
+        self.assertEqual(fetched, [1])
+        pages.close()
+
+
+class TestIterNumberedPages(unittest.TestCase):
+
+    def test_iter_numbered_pages_stops_at_last_page(self):
+        requested = []
+
+        def fetch_page(page):
+            requested.append(page)
+            return [page] * (2 if page < 3 else 1)
+
+        pages = list(iter_numbered_pages(fetch_page, lambda page: len(page) < 2, pages_in_flight=3))
+        self.assertEqual(pages, [(1, [1, 1]), (2, [2, 2]), (3, [3])])
+        self.assertLessEqual(max(requested), 5)
+
+    def test_iter_numbered_pages_keeps_pages_in_flight(self):
+        started = threading.Barrier(3, timeout=5)
+
+        def fetch_page(page):
+            if page <= 3:
+                started.wait()
+            return [] if page == 3 else [page]
+
+        pages = list(iter_numbered_pages(fetch_page, lambda page: not page, pages_in_flight=3))
+        self.assertEqual(pages, [(1, [1]), (2, [2]), (3, [])])
+
+    def test_iter_numbered_pages_rejects_no_pages_in_flight(self):
+        with self.assertRaises(ValueError):
+            list(iter_numbered_pages(lambda page: [], lambda page: True, pages_in_flight=0))
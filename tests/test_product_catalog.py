@@ -1,5 +1,8 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock
+from baselinker.pagination import BaselinkerError
 from baselinker.product_catalog import ProductCatalog
 
 
@@ -233,6 +236,13 @@ class TestProductCatalog(unittest.TestCase):
         self.mock_request.make_request.assert_called_with('getInventoryProductsData', **expected_params)
         self.assertTrue(result['success'])
 
+    def test_stream_inventory_products_data(self):
+        self.mock_request.stream_request.return_value = iter([('1', {'sku': 'A'})])
+        result = list(self.product_catalog.stream_inventory_products_data(inventory_id=1, products=[1]))
+        self.mock_request.stream_request.assert_called_with('getInventoryProductsData', 'products', inventory_id=1,
+                                                            products=[1])
+        self.assertEqual(result, [('1', {'sku': 'A'})])
+
     def test_get_inventory_products_list(self):
         expected_params = {'inventory_id': 1, 'filter_id': 2, 'filter_category_id': 3, 'filter_ean': '1234567890123',
                            'filter_sku': 'TEST123', 'filter_name': 'Test', 'filter_price_from': 50.0,
@@ -287,3 +297,82 @@ class TestProductCatalog(unittest.TestCase):
                                                                  log_type=1, sort='ASC', page=1)
         self.mock_request.make_request.assert_called_with('getInventoryProductLogs', **expected_params)
         self.assertTrue(result['success'])
+
+
+class TestIterInventoryProducts(unittest.TestCase):
+
+    def test_iter_inventory_products_walks_all_pages(self):
+        catalog_products = {product_id: {'id': product_id, 'sku': 'SKU-{}'.format(product_id)}
+                            for product_id in range(1, 2501)}
+        pages = []
+
+        def make_request(method_name, page=None, **kwargs):
+            pages.append(page)
+            ids = sorted(catalog_products)[(page - 1) * 1000:page * 1000]
+            return {'status': 'SUCCESS', 'products': {str(product_id): catalog_products[product_id]
+                                                      for product_id in ids}}
+
+        product_catalog = ProductCatalog('my_token', request=MagicMock(make_request=make_request))
+        products = list(product_catalog.iter_inventory_products(1, pages_in_flight=3, filter_category_id=5))
+        self.assertEqual([product['id'] for product in products], list(range(1, 2501)))
+        self.assertEqual(sorted(pages)[:3], [1, 2, 3])
+
+    def test_iter_inventory_products_with_empty_catalog(self):
+        request = MagicMock()
+        request.make_request.return_value = {'status': 'SUCCESS', 'products': []}
+        product_catalog = ProductCatalog('my_token', request=request)
+        self.assertEqual(list(product_catalog.iter_inventory_products(1)), [])
+
+
+class TestIterInventoryProductsData(unittest.TestCase):
+
+    def test_iter_inventory_products_data_fetches_chunks(self):
+        calls = []
+
+        def make_request(method_name, inventory_id, products):
+            calls.append(products)
+            return {'status': 'SUCCESS', 'products': {str(product_id): {'sku': 'SKU-{}'.format(product_id)}
+                                                      for product_id in products}}
+
+        product_catalog = ProductCatalog('my_token', request=MagicMock(make_request=make_request))
+        products = list(product_catalog.iter_inventory_products_data(1, iter(range(1, 251)), chunk_size=100,
+                                                                     max_workers=2))
+        self.assertEqual([product_id for product_id, _ in products], [str(i) for i in range(1, 251)])
+        self.assertEqual(sorted(len(chunk) for chunk in calls), [50, 100, 100])
+
+    def test_iter_inventory_products_data_raises_error_response(self):
+        request = MagicMock()
+        request.make_request.return_value = {'status': 'ERROR', 'error_code': 'ERROR_X'}
+        product_catalog = ProductCatalog('my_token', request=request)
+        with self.assertRaises(BaselinkerError):
+            list(product_catalog.iter_inventory_products_data(1, [1, 2]))
+
+
+class TestBulkUpdateInventoryProductsStock(unittest.TestCase):
+
+    def test_bulk_update_splits_products_into_chunks(self):
+        calls = []
+
+        def make_request(method_name, inventory_id, products):
+            calls.append(products)
+            return {'status': 'SUCCESS', 'counter': len(products), 'warnings': {}}
+
+        product_catalog = ProductCatalog('my_token', request=MagicMock(make_request=make_request))
+        stocks = {product_id: {'bl_1': product_id} for product_id in range(2500)}
+        report = product_catalog.bulk_update_inventory_products_stock(1, stocks)
+        self.assertEqual(report['counter'], 2500)
+        self.assertEqual(sorted(len(chunk) for chunk in calls), [500, 1000, 1000])
+        self.assertEqual(calls[0][0], {'bl_1': 0})
+
+    def test_bulk_update_sends_every_feed_with_the_same_checkpoint(self):
+        request = MagicMock()
+        request.make_request.return_value = {'status': 'SUCCESS', 'counter': 2, 'warnings': {}}
+        product_catalog = ProductCatalog('my_token', request=request)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'stock.json')
+            product_catalog.bulk_update_inventory_products_stock(1, {1: {'bl_1': 5}, 2: {'bl_1': 3}},
+                                                                 checkpoint_path=path)
+            report = product_catalog.bulk_update_inventory_products_stock(1, {1: {'bl_1': 4}, 2: {'bl_1': 3}},
+                                                                          checkpoint_path=path)
+        self.assertEqual(request.make_request.call_count, 2)
+        self.assertEqual(report['counter'], 2)
@@ -0,0 +1,101 @@
+import multiprocessing
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from baselinker import TokenBucket, SqliteTokenBucket
+
+
+def _reserve_many(path, count, queue):
+    bucket = SqliteTokenBucket(path, rate=60, per=60, burst=5)
+    queue.put([bucket.reserve() for _ in range(count)])
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_init_with_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+    def test_init_with_invalid_burst(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=100, burst=0)
+
+    @patch('baselinker.rate_limiter.time.monotonic', return_value=0.0)
+    def test_reserve_within_burst_does_not_wait(self, mock_monotonic):
+        bucket = TokenBucket(rate=100, per=60, burst=3)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.0])
+
+    @patch('baselinker.rate_limiter.time.monotonic', return_value=0.0)
+    def test_reserve_over_burst_queues_callers(self, mock_monotonic):
+        bucket = TokenBucket(rate=100, per=60, burst=1)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 0.6)
+        self.assertAlmostEqual(bucket.reserve(), 1.2)
+
+    @patch('baselinker.rate_limiter.time.monotonic')
+    def test_reserve_refills_over_time(self, mock_monotonic):
+        mock_monotonic.return_value = 0.0
+        bucket = TokenBucket(rate=100, per=60, burst=1)
+        bucket.reserve()
+        mock_monotonic.return_value = 0.6
+        self.assertEqual(bucket.reserve(), 0.0)
+
+    @patch('baselinker.rate_limiter.time.sleep')
+    @patch('baselinker.rate_limiter.time.monotonic', return_value=0.0)
+    def test_acquire_sleeps_for_delay(self, mock_monotonic, mock_sleep):
+        bucket = TokenBucket(rate=100, per=60, burst=1)
+        bucket.acquire()
+        mock_sleep.assert_not_called()
+        bucket.acquire()
+        mock_sleep.assert_called_once()
+        self.assertAlmostEqual(mock_sleep.call_args[0][0], 0.6)
+
+    @patch('baselinker.rate_limiter.time.monotonic', return_value=0.0)
+    def test_reserve_is_thread_safe(self, mock_monotonic):
+        bucket = TokenBucket(rate=60, per=60, burst=1)
+        delays = []
+        threads = [threading.Thread(target=lambda: delays.append(bucket.reserve())) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(delays), [float(i) for i in range(20)])
+
+
+class TestSqliteTokenBucket(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'limiter.sqlite')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    @patch('baselinker.rate_limiter.time.time', return_value=1000.0)
+    def test_reserve_is_shared_between_instances(self, mock_time):
+        first = SqliteTokenBucket(self.path, rate=100, per=60, burst=1)
+        second = SqliteTokenBucket(self.path, rate=100, per=60, burst=1)
+        self.assertEqual(first.reserve(), 0.0)
+        self.assertAlmostEqual(second.reserve(), 0.6)
+        self.assertAlmostEqual(first.reserve(), 1.2)
+
+    @patch('baselinker.rate_limiter.time.time', return_value=1000.0)
+    def test_keys_are_independent(self, mock_time):
+        first = SqliteTokenBucket(self.path, rate=100, burst=1, key='token_a')
+        second = SqliteTokenBucket(self.path, rate=100, burst=1, key='token_b')
+        self.assertEqual(first.reserve(), 0.0)
+        self.assertEqual(second.reserve(), 0.0)
+
+    def test_reserve_is_shared_between_processes(self):
+        SqliteTokenBucket(self.path, rate=60, per=60, burst=5)
+        queue = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=_reserve_many, args=(self.path, 5, queue)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        delays = sorted(delay for _ in processes for delay in queue.get(timeout=30))
+        for process in processes:
+            process.join()
+        self.assertEqual(delays[:5], [0.0] * 5)
+        self.assertGreater(delays[-1], 14.0)
@@ -0,0 +1,173 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock
+import requests
+from baselinker import BaselinkerError, ReceiptPoller
+
+
+class TestReceiptPoller(unittest.TestCase):
+
+    def setUp(self):
+        self.waiting = {1: [{'receipt_id': 11, 'order_id': 1}], 2: [{'receipt_id': 21, 'order_id': 2}]}
+        self.orders = MagicMock()
+        self.orders.get_new_receipts.side_effect = lambda series_id: {'status': 'SUCCESS',
+                                                                      'receipts': self.waiting[series_id]}
+        self.orders.set_order_receipt.side_effect = self.set_order_receipt
+        self.print_receipt = MagicMock(side_effect=lambda receipt: 'NR/{}'.format(receipt['receipt_id']))
+        self.directory = tempfile.TemporaryDirectory()
+        self.record_path = os.path.join(self.directory.name, 'printed.ndjson')
+
+    def set_order_receipt(self, receipt_id, **kwargs):
+        for receipts in self.waiting.values():
+            receipts[:] = [receipt for receipt in receipts if receipt['receipt_id'] != receipt_id]
+        return {'status': 'SUCCESS'}
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def create_poller(self, **kwargs):
+        return ReceiptPoller(self.orders, self.print_receipt, self.record_path, series_ids=[1, 2], **kwargs)
+
+    def test_poll_once_prints_and_confirms_all_series(self):
+        poller = self.create_poller()
+
+        self.assertEqual(poller.poll_once(), 2)
+        poller.wait_for_confirmations()
+        self.assertEqual(set(poller.printed), {11, 21})
+        self.assertEqual(poller.poll_once(), 0)
+        poller.close()
+
+        self.assertEqual(self.print_receipt.call_count, 2)
+        self.orders.set_order_receipt.assert_any_call(receipt_id=11, receipt_nr='NR/11', date=unittest.mock.ANY,
+                                                      printer_error=None)
+        self.assertEqual(self.orders.set_order_receipt.call_count, 2)
+        self.assertEqual(poller.printed, {})
+
+    def test_printed_receipts_are_not_printed_again_after_restart(self):
+        self.orders.set_order_receipt.side_effect = None
+        self.orders.set_order_receipt.return_value = {'status': 'ERROR', 'error_code': 'ERROR_X'}
+        poller = self.create_poller()
+        poller.poll_once()
+        poller.close()
+        self.assertEqual(set(poller.printed), {11, 21})
+
+        self.orders.set_order_receipt.side_effect = self.set_order_receipt
+        restarted = self.create_poller()
+        self.assertEqual(restarted.poll_once(), 0)
+        restarted.wait_for_confirmations()
+        self.assertEqual(restarted.poll_once(), 0)
+        restarted.close()
+
+        self.assertEqual(self.print_receipt.call_count, 2)
+        self.assertEqual(self.orders.set_order_receipt.call_count, 4)
+        self.assertEqual(restarted.printed, {})
+        self.assertEqual(self.create_poller().printed, {})
+
+    def test_record_is_compacted_after_confirmations(self):
+        poller = self.create_poller()
+        poller.poll_once()
+        poller.wait_for_confirmations()
+        poller.poll_once()
+        poller.close()
+        with open(self.record_path) as file:
+            self.assertEqual(len(file.readlines()), 4)
+
+        self.create_poller().close()
+        with open(self.record_path) as file:
+            self.assertEqual(file.read(), '')
+
+    def test_receipt_returned_by_poll_sent_before_confirmation_is_not_printed_again(self):
+        waiting = [{'receipt_id': 1, 'order_id': 1}]
+        polls = []
+        second_poll_sent = threading.Event()
+
+        def get_new_receipts(series_id):
+            snapshot = list(waiting)
+            polls.append(snapshot)
+            if len(polls) == 2:
+                # The server answered before the confirmation landed, which finishes before the answer arrives.
+                second_poll_sent.set()
+                poller.wait_for_confirmations(timeout=5)
+            return {'status': 'SUCCESS', 'receipts': snapshot}
+
+        def set_order_receipt(receipt_id, **kwargs):
+            second_poll_sent.wait(timeout=5)
+            waiting.clear()
+            return {'status': 'SUCCESS'}
+
+        self.orders.get_new_receipts.side_effect = get_new_receipts
+        self.orders.set_order_receipt.side_effect = set_order_receipt
+        poller = ReceiptPoller(self.orders, self.print_receipt, self.record_path)
+
+        self.assertEqual(poller.poll_once(), 1)
+        self.assertEqual(poller.poll_once(), 0)
+        self.assertEqual(set(poller.printed), {1})
+        self.assertEqual(poller.poll_once(), 0)
+        poller.close()
+
+        self.assertEqual(self.print_receipt.call_count, 1)
+        self.assertEqual(self.orders.set_order_receipt.call_count, 1)
+        self.assertEqual(poller.printed, {})
+        self.assertEqual([len(snapshot) for snapshot in polls], [1, 1, 0])
+
+    def test_run_keeps_polling_after_failed_poll(self):
+        responses = iter([requests.ConnectionError('down'), {'status': 'ERROR', 'error_code': 'ERROR_X'}])
+        stop_event = threading.Event()
+
+        def get_new_receipts(series_id):
+            response = next(responses, None)
+            if response is None:
+                stop_event.set()
+                return {'status': 'SUCCESS', 'receipts': []}
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        self.orders.get_new_receipts.side_effect = get_new_receipts
+        poller = ReceiptPoller(self.orders, self.print_receipt, self.record_path, min_interval=0.001,
+                               max_interval=0.01, max_errors=1)
+        poller.run(stop_event)
+
+        self.assertEqual(len(poller.errors), 1)
+        self.assertIsInstance(poller.errors[0][1], BaselinkerError)
+
+    def test_partial_record_line_is_discarded(self):
+        with open(self.record_path, 'w') as file:
+            file.write('{"receipt_id": 11, "receipt_nr": "NR/11", "date": 1}\n{"receipt_id": 2')
+
+        poller = self.create_poller()
+        poller.close()
+
+        self.assertEqual(list(poller.printed), [11])
+        with open(self.record_path) as file:
+            self.assertEqual(file.read(), '{"receipt_id": 11, "receipt_nr": "NR/11", "date": 1}\n')
+
+    def test_printer_error_is_reported(self):
+        self.print_receipt.side_effect = RuntimeError('paper jam')
+        poller = self.create_poller()
+
+        self.assertEqual(poller.poll_once(), 2)
+        poller.close()
+
+        self.orders.set_order_receipt.assert_any_call(receipt_id=11, receipt_nr='', date=unittest.mock.ANY,
+                                                      printer_error=True)
+        self.assertEqual(poller.printed, {})
+        self.assertEqual(len(poller.errors), 2)
+
+    def test_interval_adapts_to_traffic(self):
+        poller = self.create_poller(min_interval=1, max_interval=5, backoff=2)
+        poller.poll_once()
+        self.assertEqual(poller.interval, 1)
+        self.waiting = {1: [], 2: []}
+        intervals = []
+        for _ in range(4):
+            poller.poll_once()
+            intervals.append(poller.interval)
+        poller.close()
+        self.assertEqual(intervals, [2, 4, 5, 5])
+
+    def test_invalid_intervals(self):
+        with self.assertRaises(ValueError):
+            self.create_poller(min_interval=10, max_interval=1)
@@ -1,7 +1,12 @@
+import base64
+import io
+import json
 import unittest
+from urllib.parse import parse_qs
 import requests
-from unittest.mock import patch
-from baselinker import Request
+from unittest.mock import MagicMock, patch
+from baselinker import NULL, Request, RetryPolicy
+from baselinker.json_codec import StdlibCodec
 
 
 class TestRequest(unittest.TestCase):
@@ -30,7 +35,7 @@ class TestRequest(unittest.TestCase):
     def test_get_request_data_with_parameters(self):
         method_name = 'test_method'
         parameters = {'param1': 'value1', 'param2': 'value2'}
-        expected_request_data = {'method': method_name, 'parameters': '{"param1": "value1", "param2": "value2"}'}
+        expected_request_data = {'method': method_name, 'parameters': '{"param1":"value1","param2":"value2"}'}
 
         request_data = self.request._Request__get_request_data(method_name, parameters)
 
@@ -47,10 +52,10 @@ class TestRequest(unittest.TestCase):
     def test_make_request_success(self, mock_post):
         method_name = 'test_method'
         parameters = {'param1': 'value1', 'param2': 'value2'}
-        expected_request_data = {'method': method_name, 'parameters': '{"param1": "value1", "param2": "value2"}'}
+        expected_request_data = {'method': method_name, 'parameters': '{"param1":"value1","param2":"value2"}'}
         expected_headers = {'X-BLToken': self.api_token}
-        expected_response_content = '{"status": "success", "result": "Test Result"}'
-        mock_post.return_value.content.decode.return_value = expected_response_content
+        expected_response_content = b'{"status": "success", "result": "Test Result"}'
+        mock_post.return_value.content = expected_response_content
 
         response = self.request.make_request(method_name, **parameters)
 
@@ -65,3 +70,191 @@ class TestRequest(unittest.TestCase):
 
         with self.assertRaises(requests.RequestException):
             self.request.make_request(method_name, **parameters)
+
+    def test_session_is_reused_between_requests(self):
+        self.assertIs(self.request.session, self.request.session)
+        adapter = self.request.session.get_adapter(self.request.api_url)
+        self.assertEqual(adapter._pool_maxsize, 10)
+
+    def test_init_with_pool_settings(self):
+        request = Request(api_token=self.api_token, pool_maxsize=32, max_retries=3, keep_alive=False)
+        adapter = request.session.get_adapter(request.api_url)
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertEqual(request.session.headers['Connection'], 'close')
+
+    @patch('requests.Session.close')
+    def test_context_manager_closes_session(self, mock_close):
+        with Request(api_token=self.api_token):
+            pass
+        mock_close.assert_called_once()
+
+    @patch('requests.Session.post')
+    def test_make_request_acquires_rate_limiter(self, mock_post):
+        rate_limiter = MagicMock()
+        request = Request(api_token=self.api_token, rate_limiter=rate_limiter)
+        mock_post.return_value.content = b'{"status": "SUCCESS"}'
+
+        request.make_request('test_method')
+
+        rate_limiter.acquire.assert_called_once_with()
+
+    @patch('baselinker.request.time.sleep')
+    @patch('requests.Session.post')
+    def test_make_request_retries_transient_errors(self, mock_post, mock_sleep):
+        retry_policy = RetryPolicy(max_attempts=3)
+        request = Request(api_token=self.api_token, retry_policy=retry_policy)
+        success = MagicMock(status_code=200, content=b'{"status": "SUCCESS"}')
+        mock_post.side_effect = [requests.ConnectionError('reset'), MagicMock(status_code=503), success]
+
+        response = request.make_request('getOrders')
+
+        self.assertEqual(response, {'status': 'SUCCESS'})
+        self.assertEqual(mock_post.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(retry_policy.retries_by_method['getOrders'], 2)
+
+    @patch('baselinker.request.time.sleep')
+    @patch('requests.Session.post')
+    def test_make_request_retries_throttled_response(self, mock_post, mock_sleep):
+        retry_policy = RetryPolicy(max_attempts=2)
+        request = Request(api_token=self.api_token, retry_policy=retry_policy)
+        throttled = MagicMock(status_code=200, content=b'{"status": "ERROR", "error_code": "ERROR_BLOCKED_TOKEN"}')
+        mock_post.side_effect = [throttled, throttled]
+
+        response = request.make_request('addInvoice', order_id=1)
+
+        self.assertEqual(response['error_code'], 'ERROR_BLOCKED_TOKEN')
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual(retry_policy.retries_by_reason['ERROR_BLOCKED_TOKEN'], 1)
+
+    @patch('builtins.print')
+    @patch('requests.Session.post', side_effect=requests.ConnectionError('reset'))
+    def test_make_request_does_not_retry_non_idempotent_methods(self, mock_post, mock_print):
+        request = Request(api_token=self.api_token, retry_policy=RetryPolicy())
+
+        with self.assertRaises(requests.ConnectionError):
+            request.make_request('addInvoice', order_id=1)
+
+        mock_post.assert_called_once()
+
+    def test_get_request_data_skips_none_parameters(self):
+        parameters = {'param1': 'value1', 'param2': None}
+        expected_request_data = {'method': 'test_method', 'parameters': '{"param1":"value1"}'}
+
+        request_data = self.request._Request__get_request_data('test_method', parameters)
+
+        self.assertEqual(request_data, expected_request_data)
+
+    def test_get_request_data_with_only_none_parameters(self):
+        request_data = self.request._Request__get_request_data('test_method', {'param1': None})
+
+        self.assertEqual(request_data, {'method': 'test_method'})
+
+    def test_get_request_data_sends_explicit_null(self):
+        parameters = {'param1': NULL, 'param2': None}
+        expected_request_data = {'method': 'test_method', 'parameters': '{"param1":null}'}
+
+        request_data = self.request._Request__get_request_data('test_method', parameters)
+
+        self.assertEqual(request_data, expected_request_data)
+
+    def test_init_with_codec_name(self):
+        request = Request(api_token=self.api_token, codec='json')
+        self.assertIsInstance(request.codec, StdlibCodec)
+
+    def test_init_with_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            Request(api_token=self.api_token, codec='unknown')
+
+    def test_init_with_codec_object(self):
+        codec = MagicMock()
+        codec.dumps.return_value = 'encoded'
+        request = Request(api_token=self.api_token, codec=codec)
+
+        request_data = request._Request__get_request_data('test_method', {'param1': 'value1'})
+
+        self.assertEqual(request_data['parameters'], 'encoded')
+        codec.dumps.assert_called_once_with({'param1': 'value1'})
+
+    @patch('requests.Session.post')
+    def test_stream_request_yields_records(self, mock_post):
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.iter_content.return_value = [b'{"status": "SUCCESS", "orders": [{"order_id"',
+                                                            b': 1}, {"order_id": 2}]}']
+
+        orders = list(self.request.stream_request('getOrders', 'orders', status_id=1))
+
+        self.assertEqual(orders, [{'order_id': 1}, {'order_id': 2}])
+        mock_post.assert_called_once_with(self.request.api_url,
+                                          data={'method': 'getOrders', 'parameters': '{"status_id":1}'},
+                                          headers={'X-BLToken': self.api_token}, stream=True)
+
+    @patch('baselinker.request.time.sleep')
+    @patch('requests.Session.post')
+    def test_stream_request_retries_throttled_response(self, mock_post, mock_sleep):
+        retry_policy = RetryPolicy(max_attempts=3)
+        request = Request(api_token=self.api_token, retry_policy=retry_policy)
+        throttled = MagicMock(status_code=200)
+        throttled.iter_content.return_value = [b'{"status": "ERROR", "error_code": "ERROR_BLOCKED_TOKEN"}']
+        success = MagicMock(status_code=200)
+        success.iter_content.return_value = [b'{"status": "SUCCESS", "orders": [{"order_id": 1}]}']
+        mock_post.side_effect = [throttled, success]
+
+        orders = list(request.stream_request('getOrders', 'orders'))
+
+        self.assertEqual(orders, [{'order_id': 1}])
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual(mock_sleep.call_count, 1)
+        self.assertEqual(retry_policy.retries_by_reason['ERROR_BLOCKED_TOKEN'], 1)
+
+    @patch('baselinker.request.time.sleep')
+    @patch('requests.Session.post')
+    def test_stream_request_raises_on_error_response(self, mock_post, mock_sleep):
+        request = Request(api_token=self.api_token, retry_policy=RetryPolicy(max_attempts=3))
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.iter_content.return_value = [b'{"status": "ERROR", "error_code": "ERROR_EMPTY"}']
+
+        with self.assertRaises(ValueError):
+            list(request.stream_request('getOrders', 'orders'))
+
+        mock_post.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch('requests.Session.post')
+    def test_upload_request_streams_base64_file(self, mock_post):
+        content = bytes(range(256)) * 1000
+        bodies = []
+
+        def post(url, data, headers):
+            bodies.append(b''.join(data))
+            return MagicMock(status_code=200, content=b'{"status": "SUCCESS"}')
+        mock_post.side_effect = post
+
+        response = self.request.upload_request('addOrderInvoiceFile', 'file', io.BytesIO(content), invoice_id=1,
+                                               external_invoice_number=None)
+
+        self.assertEqual(response, {'status': 'SUCCESS'})
+        form = parse_qs(bodies[0].decode('ascii'))
+        self.assertEqual(form['method'], ['addOrderInvoiceFile'])
+        self.assertEqual(json.loads(form['parameters'][0]),
+                         {'invoice_id': 1, 'file': 'data:' + base64.b64encode(content).decode('ascii')})
+        self.assertEqual(mock_post.call_args[1]['headers']['Content-Type'], 'application/x-www-form-urlencoded')
+
+    @patch('baselinker.request.time.sleep')
+    @patch('requests.Session.post')
+    def test_upload_request_rewinds_file_on_retry(self, mock_post, mock_sleep):
+        request = Request(api_token=self.api_token, retry_policy=RetryPolicy(max_attempts=2))
+        bodies = []
+        throttled = b'{"status": "ERROR", "error_code": "ERROR_BLOCKED_TOKEN"}'
+
+        def post(url, data, headers):
+            bodies.append(b''.join(data))
+            return MagicMock(status_code=200, content=throttled if len(bodies) == 1 else b'{"status": "SUCCESS"}')
+        mock_post.side_effect = post
+
+        response = request.upload_request('addOrderInvoiceFile', 'file', io.BytesIO(b'%PDF-1.4'), invoice_id=1)
+
+        self.assertEqual(response, {'status': 'SUCCESS'})
+        self.assertEqual(len(bodies), 2)
+        self.assertEqual(bodies[0], bodies[1])
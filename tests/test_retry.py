@@ -0,0 +1,48 @@
+import unittest
+from unittest.mock import patch
+import requests
+from baselinker import RetryPolicy
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = RetryPolicy()
+
+    def test_init_with_invalid_max_attempts(self):
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+    def test_connection_error_is_retried_for_get_methods(self):
+        reason = self.policy.get_retry_reason('getOrders', exception=requests.ConnectionError())
+        self.assertEqual(reason, 'ConnectionError')
+
+    def test_server_error_is_retried_for_allowed_write_methods(self):
+        self.assertEqual(self.policy.get_retry_reason('setOrderStatus', status_code=503), 'HTTP 503')
+
+    def test_non_idempotent_write_is_not_retried(self):
+        self.assertIsNone(self.policy.get_retry_reason('addInvoice', exception=requests.ConnectionError()))
+        self.assertIsNone(self.policy.get_retry_reason('addInvoice', status_code=502))
+
+    def test_throttling_error_is_retried_for_every_method(self):
+        content = {'status': 'ERROR', 'error_code': 'ERROR_BLOCKED_TOKEN'}
+        self.assertEqual(self.policy.get_retry_reason('addInvoice', content=content), 'ERROR_BLOCKED_TOKEN')
+
+    def test_other_errors_are_not_retried(self):
+        content = {'status': 'ERROR', 'error_code': 'ERROR_ORDER_NOT_FOUND'}
+        self.assertIsNone(self.policy.get_retry_reason('getOrders', content=content))
+        self.assertIsNone(self.policy.get_retry_reason('getOrders', status_code=400))
+        self.assertIsNone(self.policy.get_retry_reason('getOrders', content={'status': 'SUCCESS'}))
+
+    @patch('baselinker.retry.random.uniform', side_effect=lambda low, high: high)
+    def test_get_delay_grows_exponentially_and_is_capped(self, mock_uniform):
+        policy = RetryPolicy(backoff_base=1.0, backoff_max=5.0)
+        self.assertEqual([policy.get_delay(attempt) for attempt in range(1, 5)], [1.0, 2.0, 4.0, 5.0])
+
+    def test_record_counts_retries(self):
+        self.policy.record('getOrders', 'HTTP 503')
+        self.policy.record('getOrders', 'ConnectionError')
+        self.policy.record('setOrderStatus', 'HTTP 503')
+        self.assertEqual(self.policy.total_retries, 3)
+        self.assertEqual(self.policy.retries_by_method['getOrders'], 2)
+        self.assertEqual(self.policy.retries_by_reason['HTTP 503'], 2)